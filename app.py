@@ -1,9 +1,22 @@
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib.machinery import ModuleSpec
 import streamlit as st
-from src.resume_parser import parse_resume, generate_overview
+from src.ingest import _init_worker, process_one
+from src.resume_parser import PDF_MAX_CHARS, PDF_MAX_MEMORY_MB, PDF_MAX_PAGES, PDF_TIMEOUT, render_overview
+from src.resume_store import ResumeStore
 from src.jd_parser import parse_jd
 from src.embedder import TextEmbedder
 from src.matcher import compute_skill_coverage, compute_overall_score
 from src.ats import compute_ats_score
+from src import metrics
+from src.document import AnalyzedDocument
+
+# Streamlit runs this script as __main__, so spawned parse workers would re-run the
+# whole page while starting up; this spec tells multiprocessing to skip that.
+__spec__ = ModuleSpec("__main__", None)
 
 st.set_page_config(page_title="Smart Resume Analyzer", layout="wide", initial_sidebar_state="expanded")
 
@@ -21,7 +34,133 @@ st.markdown(
 st.markdown('<div class="title">🧠 Smart Resume Analyzer — Final (Polished)</div>', unsafe_allow_html=True)
 st.write("Upload a resume (PDF) and paste the job description. The app computes semantic match, ATS compatibility, and gives clean suggestions.")
 
-embedder = TextEmbedder()
+# RESUME_METRICS=1 enables instrumentation; RESUME_METRICS_PORT exposes /metrics
+if metrics.enabled() and os.environ.get("RESUME_METRICS_PORT"):
+    metrics.serve(int(os.environ["RESUME_METRICS_PORT"]))
+
+@st.cache_resource
+def get_embedder():
+    return TextEmbedder()
+
+@st.cache_resource
+def get_store():
+    return ResumeStore(os.environ.get("RESUME_STORE", "resume_store.sqlite3"))
+
+# Per-upload and per-JD work is cached separately, so editing only the JD
+# re-runs the JD parse/embedding plus the cheap coverage and ATS scoring.
+@st.cache_data(max_entries=32, show_spinner=False)
+def analyze_resume(pdf_bytes):
+    resume = get_store().parse(pdf_bytes)
+    embedding = get_embedder().encode([resume['raw_text']])[0]
+    return resume, embedding, render_overview(resume['overview'])
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def resume_document(raw_text):
+    return AnalyzedDocument(raw_text)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def analyze_jd(jd_text):
+    jd = parse_jd(jd_text)
+    return jd, get_embedder().encode([jd['raw_text']])[0]
+
+def _start_parse_pool():
+    # one pool per batch, so Cancel can drop its queued files without touching other sessions;
+    # spawn, because forking Streamlit's threads can deadlock the workers
+    limits = {"max_pages": PDF_MAX_PAGES, "max_chars": PDF_MAX_CHARS, "timeout": PDF_TIMEOUT}
+    return ProcessPoolExecutor(mp_context=mp.get_context("spawn"), initializer=_init_worker,
+                               initargs=(limits, PDF_MAX_MEMORY_MB))
+
+def _stop_batch(batch):
+    """Drop the batch's queued files; ones already parsing finish within the PDF timeout."""
+    if batch and batch["pool"] is not None:
+        batch["pool"].shutdown(wait=False, cancel_futures=True)
+        batch["pool"] = None
+
+def _score_parsed(records, jd, jd_vec):
+    """Score newly parsed resumes against the JD; one encode call for the whole group."""
+    vecs = get_embedder().encode([r['raw_text'] for r in records])
+    rows = []
+    for i, r in enumerate(records):
+        sem = TextEmbedder.vector_similarity(vecs[i], jd_vec)
+        cov, matched, missing = compute_skill_coverage(r['skills'], jd['required_skills'])
+        ats = compute_ats_score(r['raw_text'], jd['required_skills'], r['skills'])
+        rows.append({
+            "File": r['source'],
+            "Overall": compute_overall_score(sem, cov),
+            "ATS": ats['score'],
+            "Semantic": round(sem, 3),
+            "Skill coverage %": round(cov * 100, 1),
+            "Matched": ", ".join(matched),
+            "Missing": ", ".join(missing),
+        })
+    return rows
+
+def render_batch_mode():
+    files = st.file_uploader("Upload resumes (PDF)", type=["pdf"], accept_multiple_files=True)
+    jd_text = st.text_area("Paste Job Description here", height=240)
+    c1, c2 = st.columns([1, 1])
+    start = c1.button("Rank Resumes", type="primary")
+    cancel = c2.button("Cancel")
+
+    if start:
+        if not files or not jd_text.strip():
+            st.error("Please upload resumes and paste a job description.")
+            return
+        _stop_batch(st.session_state.get("batch"))
+        pool = _start_parse_pool()
+        pending = {pool.submit(process_one, (f.name, f.getvalue())): f.name for f in files}
+        st.session_state["batch"] = {"jd_text": jd_text, "pending": pending, "rows": [], "errors": [], "pool": pool,
+                                     "total": len(pending), "cancelled": False, "started": time.time()}
+
+    batch = st.session_state.get("batch")
+    if not batch:
+        st.write("Upload resumes and paste a job description, then click 'Rank Resumes'.")
+        return
+    if cancel and batch["pending"]:
+        _stop_batch(batch)
+        batch["pending"].clear()
+        batch["cancelled"] = True
+
+    # only the progress/results fragment reruns while files are parsing
+    st.fragment(render_batch_progress, run_every=0.5 if batch["pending"] else None)(batch)
+
+def render_batch_progress(batch):
+    # collect whatever finished since the last run, without blocking
+    done = [f for f in batch["pending"] if f.done()]
+    parsed = []
+    for fut in done:
+        name = batch["pending"].pop(fut)
+        if fut.cancelled():
+            continue
+        try:
+            rec = fut.result()
+        except Exception as e:
+            batch["errors"].append((name, f"{type(e).__name__}: {e}"))
+            continue
+        if rec["ok"]:
+            parsed.append(rec)
+        else:
+            batch["errors"].append((name, rec["error"]))
+    if parsed:
+        jd, jd_vec = analyze_jd(batch["jd_text"])
+        batch["rows"].extend(_score_parsed(parsed, jd, jd_vec))
+
+    finished = len(batch["rows"]) + len(batch["errors"])
+    st.progress(finished / batch["total"] if batch["total"] else 1.0,
+                text=f"{finished} / {batch['total']} processed in {time.time() - batch['started']:.1f}s"
+                     + (" (cancelled)" if batch["cancelled"] else ""))
+    rows = sorted(batch["rows"], key=lambda r: (r["Overall"], r["ATS"]), reverse=True)
+    if rows:
+        st.dataframe(rows, hide_index=True)
+    if batch["errors"]:
+        with st.expander(f"{len(batch['errors'])} file(s) failed"):
+            for name, err in batch["errors"]:
+                st.error(f"{name}: {err}")
+
+    if done and not batch["pending"]:
+        _stop_batch(batch)
+        # one full rerun to stop the fragment's polling
+        st.rerun()
 
 # Sidebar: instructions only
 with st.sidebar:
@@ -30,6 +169,12 @@ with st.sidebar:
     st.write("- Use clear section headers: Experience, Projects, Education, Skills.")
     st.markdown("---")
     st.write("Upload resume -> paste JD -> Analyze.")
+    st.markdown("---")
+    mode = st.radio("Mode", ["Single resume", "Batch ranking"])
+
+if mode == "Batch ranking":
+    render_batch_mode()
+    st.stop()
 
 # Layout: single left column for inputs (full width), results below across the page
 uploaded = st.file_uploader("Upload your resume (PDF)", type=["pdf"])
@@ -41,13 +186,12 @@ if analyze:
         st.error("Please upload a resume and paste a job description.")
     else:
         with st.spinner("Running analysis..."):
-            resume = parse_resume(uploaded)
-            jd = parse_jd(jd_text)
-            semantic_sim = embedder.similarity(resume['raw_text'], jd['raw_text'])
+            resume, resume_vec, overview_md = analyze_resume(uploaded.getvalue())
+            jd, jd_vec = analyze_jd(jd_text)
+            semantic_sim = TextEmbedder.vector_similarity(resume_vec, jd_vec)
             skill_cov, matched_skills, missing_skills = compute_skill_coverage(resume['skills'], jd['required_skills'])
             overall_match = compute_overall_score(semantic_sim, skill_cov)
-            ats = compute_ats_score(resume['raw_text'], jd['required_skills'], resume['skills'])
-            overview_md = generate_overview(resume['raw_text'], resume['skills'])
+            ats = compute_ats_score(resume_document(resume['raw_text']), jd['required_skills'], resume['skills'])
 
         # derive components safely
         comps = ats.get('components') or {}
@@ -1,4 +1,8 @@
 import re
+from src import metrics
+from src.document import as_document
+from src.skill_matcher import canonical_matcher
+from src.skills_db import canonical_skill
 
 ACTION = {
     "achieved","built","created","designed","developed","engineered","improved",
@@ -14,17 +18,22 @@ WEAK = {
 PASSIVE = re.compile(r'\b(am|is|are|was|were|be|been|being)\b\s+\b[\w-]+\b', re.I)
 SECTIONS = ["experience","education","projects","skills","certifications","summary","profile"]
 
+# The functions below take resume text as a str or a src.document.AnalyzedDocument;
+# passing the document lets them share one lower-casing/tokenisation pass.
+
 def top_fraction(t, f=0.3):
     w = t.split()
     return " ".join(w[:int(len(w) * f)])
 
 def keyword_density(resume, jd):
-    resume = resume.lower()
-    jd = set([s.lower() for s in jd])
+    doc = as_document(resume)
+    # canonical names on both sides, so "k8s" in the resume covers a "kubernetes"
+    # requirement here just as it does in compute_skill_coverage
+    jd = set(canonical_skill(s) for s in jd)
 
-    top = top_fraction(resume, 0.3)
-    matched_top = sorted([k for k in jd if k in top])
-    matched_any = sorted([k for k in jd if k in resume])
+    m = canonical_matcher(jd)
+    matched_top = m.find(doc.top_text(0.3), lowered=True)
+    matched_any = m.find(doc.lower, lowered=True)
     missing = sorted(list(jd - set(matched_any)))
 
     return {
@@ -36,17 +45,18 @@ def keyword_density(resume, jd):
     }
 
 def section_presence(text):
-    t = text.lower()
+    t = as_document(text).lower
     present = [h for h in SECTIONS if h in t]
     missing = [h for h in SECTIONS if h not in t]
     return {"present": present, "missing": missing, "score": len(present)/len(SECTIONS)}
 
 def action_vs_passive(text):
-    words = re.findall(r'\b[a-zA-Z-]+\b', text.lower())
+    doc = as_document(text)
+    words = doc.tokens
     wc = len(words)
 
     action_count = sum(1 for w in words if w in ACTION)
-    passive_count = len(PASSIVE.findall(text))
+    passive_count = len(PASSIVE.findall(doc.text))
 
     return {
         "action_verbs": action_count,
@@ -54,10 +64,12 @@ def action_vs_passive(text):
         "action_rate": action_count / wc if wc else 0
     }
 
+@metrics.timed("compute_ats_score")
 def compute_ats_score(text, jd_skills, resume_skills):
-    kd = keyword_density(text, jd_skills or [])
-    sp = section_presence(text)
-    av = action_vs_passive(text)
+    doc = as_document(text)
+    kd = keyword_density(doc, jd_skills or [])
+    sp = section_presence(doc)
+    av = action_vs_passive(doc)
 
     score = (
         0.5 * ((0.7 * kd["top_coverage"]) + (0.3 * kd["overall_coverage"])) +
@@ -0,0 +1,87 @@
+import numpy as np
+from scipy import sparse
+
+from src.ats import action_vs_passive, compute_ats_score, section_presence
+from src.document import as_document
+from src.skill_matcher import canonical_matcher
+from src.skills_db import canonical_skill
+
+def _presence(docs, vocab, index):
+    """CSR keyword-presence matrices (overall, top 30% of text) of shape (resumes, vocab)."""
+    m = canonical_matcher(vocab)
+    rows_all, cols_all, rows_top, cols_top = [], [], [], []
+    for i, doc in enumerate(docs):
+        for k in m.find(doc.lower, lowered=True):
+            rows_all.append(i)
+            cols_all.append(index[k])
+        for k in m.find(doc.top_text(0.3), lowered=True):
+            rows_top.append(i)
+            cols_top.append(index[k])
+    shape = (len(docs), len(vocab))
+    def csr(r, c):
+        return sparse.csr_matrix((np.ones(len(r), dtype=np.int32), (r, c)), shape=shape)
+    return csr(rows_all, cols_all), csr(rows_top, cols_top)
+
+def batch_ats_scores(resumes, jd_skill_lists):
+    """
+    compute_ats_score for every (resume, JD) pair at once.
+    resumes: list of resume texts or AnalyzedDocuments; jd_skill_lists: list of skill lists.
+    Returns a dict of arrays; matrices are shaped (len(resumes), len(jd_skill_lists)) and
+    "score" matches compute_ats_score(...)["score"] exactly.
+    """
+    docs = [as_document(r) for r in resumes]
+    jd_sets = [set(canonical_skill(s) for s in (skills or [])) for skills in jd_skill_lists]
+    vocab = sorted(set().union(*jd_sets) - {""}) if jd_sets else []
+    index = {k: j for j, k in enumerate(vocab)}
+
+    jr, jc = [], []
+    for j, skills in enumerate(jd_sets):
+        for k in skills:
+            if k in index:
+                jr.append(j)
+                jc.append(index[k])
+    J = sparse.csr_matrix((np.ones(len(jr), dtype=np.int32), (jr, jc)), shape=(len(jd_sets), len(vocab)))
+    # denominators count every distinct JD term, including ones the matcher can never find
+    jd_sizes = np.array([len(s) for s in jd_sets], dtype=np.float64)
+
+    A_all, A_top = _presence(docs, vocab, index)
+    overall_hits = (A_all @ J.T).toarray().astype(np.float64)
+    top_hits = (A_top @ J.T).toarray().astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        overall = np.where(jd_sizes > 0, overall_hits / jd_sizes, 0.0)
+        top = np.where(jd_sizes > 0, top_hits / jd_sizes, 0.0)
+
+    section = np.array([section_presence(d)["score"] for d in docs], dtype=np.float64)[:, None]
+    action = np.array([action_vs_passive(d)["action_rate"] for d in docs], dtype=np.float64)[:, None]
+
+    # same operation order as compute_ats_score so the floats come out bit-identical
+    raw = (
+        0.5 * ((0.7 * top) + (0.3 * overall)) +
+        0.2 * section +
+        0.15 * np.minimum(1, action * 50) +
+        0.1 * 1 +
+        0.05 * section
+    )
+    # Python's round() (correctly rounded), not np.round(), to reproduce the scalar scores
+    scaled = (raw * 100).ravel().tolist()
+    score = np.array([round(x, 2) for x in scaled], dtype=np.float64).reshape(raw.shape)
+
+    return {
+        "score": score,
+        "top_coverage": top,
+        "overall_coverage": overall,
+        "section_score": section.ravel(),
+        "action_rate": action.ravel(),
+    }
+
+def check_parity(resumes, jd_skill_lists):
+    """Compare batch_ats_scores with the scalar compute_ats_score; returns the mismatching pairs."""
+    docs = [as_document(r) for r in resumes]
+    batch = batch_ats_scores(docs, jd_skill_lists)["score"]
+    bad = []
+    for i, d in enumerate(docs):
+        for j, skills in enumerate(jd_skill_lists):
+            want = compute_ats_score(d, skills, [])["score"]
+            if batch[i, j] != want:
+                bad.append((i, j, want, float(batch[i, j])))
+    return bad
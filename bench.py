@@ -0,0 +1,184 @@
+"""
+Stage-by-stage latency benchmark over a synthetic corpus.
+
+    python -m src.bench --resumes 50 --out bench.json
+    python -m src.bench --corpus /data/corpus --baseline bench.json --threshold 0.25
+
+Stages: extract_text_from_pdf, clean_text, extract_skills_from_text, generate_overview,
+compute_ats_score and TextEmbedder.similarity (TF-IDF backend, so it runs offline).
+Results are JSON; with --baseline, any stage whose mean latency grew by more than
+--threshold (fraction) is reported and the exit status is 1.
+
+    python -m src.bench --startup-budget 0.5
+
+checks instead that importing resume_parser, ats and matcher in a fresh
+interpreter stays under the budget (seconds) and pulls in no heavy dependency.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.ats import compute_ats_score
+from src.bench_corpus import generate_corpus
+from src.embedder import TextEmbedder
+from src.jd_parser import parse_jd
+from src.resume_parser import clean_text, extract_skills_from_text, extract_text_from_pdf, generate_overview
+
+STAGES = ["extract_text_from_pdf", "clean_text", "extract_skills_from_text", "generate_overview",
+          "compute_ats_score", "similarity"]
+
+def _summary(samples):
+    s = sorted(samples)
+    pick = lambda q: s[min(len(s) - 1, int(q * len(s)))]
+    return {
+        "n": len(s),
+        "total_s": round(sum(s), 6),
+        "mean_ms": round(statistics.fmean(s) * 1000, 4),
+        "p50_ms": round(pick(0.5) * 1000, 4),
+        "p95_ms": round(pick(0.95) * 1000, 4),
+    }
+
+def run(corpus_dir, repeat=1):
+    with open(os.path.join(corpus_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    with open(os.path.join(corpus_dir, manifest["jds"])) as f:
+        jds = [parse_jd(t) for t in json.load(f)]
+    embedder = TextEmbedder(backend="tfidf").warm_up()
+    samples = {k: [] for k in STAGES}
+    clock = time.perf_counter
+    pages = 0
+    for _ in range(repeat):
+        for i, entry in enumerate(manifest["resumes"]):
+            path = os.path.join(corpus_dir, "resumes", entry["file"])
+            jd = jds[i % len(jds)]
+            pages += entry["pages"]
+
+            t = clock()
+            with open(path, "rb") as f:
+                raw = extract_text_from_pdf(f)
+            samples["extract_text_from_pdf"].append(clock() - t)
+
+            t = clock()
+            cleaned = clean_text(raw)
+            samples["clean_text"].append(clock() - t)
+
+            t = clock()
+            skills = extract_skills_from_text(cleaned)
+            samples["extract_skills_from_text"].append(clock() - t)
+
+            t = clock()
+            generate_overview(cleaned, skills)
+            samples["generate_overview"].append(clock() - t)
+
+            t = clock()
+            compute_ats_score(cleaned, jd["required_skills"], skills)
+            samples["compute_ats_score"].append(clock() - t)
+
+            t = clock()
+            embedder.similarity(cleaned, jd["raw_text"])
+            samples["similarity"].append(clock() - t)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "docs": len(manifest["resumes"]) * repeat,
+            "pages": pages,
+            "seed": manifest.get("seed"),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "stages": {k: _summary(v) for k, v in samples.items()},
+    }
+
+def compare(results, baseline, threshold=0.2):
+    """[(stage, baseline_ms, current_ms, ratio)] for stages slower than baseline by more than threshold."""
+    out = []
+    for stage, cur in results["stages"].items():
+        base = baseline.get("stages", {}).get(stage)
+        if not base or not base["mean_ms"]:
+            continue
+        ratio = cur["mean_ms"] / base["mean_ms"]
+        if ratio > 1 + threshold:
+            out.append((stage, base["mean_ms"], cur["mean_ms"], round(ratio, 3)))
+    return out
+
+STARTUP_MODULES = ["src.resume_parser", "src.ats", "src.matcher"]
+# must stay lazy: importing any of these costs seconds
+HEAVY_MODULES = ["pdfplumber", "sentence_transformers", "torch", "sklearn", "scipy"]
+
+_STARTUP_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+for m in sys.argv[1].split(","):
+    __import__(m)
+elapsed = time.perf_counter() - t
+print(json.dumps({"seconds": elapsed, "heavy": [m for m in sys.argv[2].split(",") if m in sys.modules]}))
+"""
+
+def measure_startup(runs=3):
+    """Best-of-N import time (fresh interpreter each run) and any heavy modules pulled in."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    best, heavy = None, []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _STARTUP_PROBE, ",".join(STARTUP_MODULES), ",".join(HEAVY_MODULES)],
+            capture_output=True, text=True, env=env, check=True,
+        )
+        r = json.loads(out.stdout)
+        best = r["seconds"] if best is None else min(best, r["seconds"])
+        heavy = r["heavy"]
+    return {"seconds": round(best, 4), "heavy": heavy}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the resume pipeline stage by stage.")
+    ap.add_argument("--corpus", help="corpus directory from src.bench_corpus (default: generate a temporary one)")
+    ap.add_argument("--resumes", type=int, default=50)
+    ap.add_argument("--jds", type=int, default=10)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--baseline", help="results JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    ap.add_argument("--startup-budget", type=float, help="only check import time of the parse/score modules (seconds)")
+    args = ap.parse_args(argv)
+
+    if args.startup_budget is not None:
+        r = measure_startup()
+        print(f"import {', '.join(STARTUP_MODULES)}: {r['seconds'] * 1000:.1f} ms (budget {args.startup_budget * 1000:.0f} ms)")
+        if r["heavy"]:
+            print(f"FAIL heavy modules imported eagerly: {', '.join(r['heavy'])}", file=sys.stderr)
+        if r["seconds"] > args.startup_budget:
+            print("FAIL startup budget exceeded", file=sys.stderr)
+        return 1 if r["heavy"] or r["seconds"] > args.startup_budget else 0
+
+    if args.corpus:
+        results = run(args.corpus, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as d:
+            generate_corpus(d, args.resumes, args.jds, args.seed)
+            results = run(d, args.repeat)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=1)
+    print(f"{'stage':<26}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for stage, r in results["stages"].items():
+        print(f"{stage:<26}{r['mean_ms']:>10.3f}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for stage, base, cur, ratio in regressions:
+            print(f"REGRESSION {stage}: {base:.3f} ms -> {cur:.3f} ms ({ratio}x)", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
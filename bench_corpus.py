@@ -0,0 +1,147 @@
+"""
+Deterministic synthetic resume/JD corpus for benchmarks.
+
+PDFs are written directly (PDF 1.4, base-14 fonts) so no PDF library is needed;
+the same seed always produces byte-identical files.
+
+    python -m src.bench_corpus out_dir --resumes 200 --jds 20 --seed 0
+"""
+import argparse
+import json
+import os
+import random
+import textwrap
+
+from src.skills_db import ALL_SKILLS
+
+_FIRST = ["Aarav", "Priya", "John", "Maria", "Wei", "Fatima", "Lucas", "Ananya", "Omar", "Elena", "Rohan", "Sara"]
+_LAST = ["Shah", "Patel", "Smith", "Garcia", "Chen", "Khan", "Silva", "Mehta", "Haddad", "Novak", "Iyer", "Berg"]
+_CITIES = ["Ahmedabad, Gujarat", "Pune, India", "Bengaluru, Karnataka", "Mumbai", "London, UK", "Austin, USA"]
+_VERBS = ["Developed", "Implemented", "Designed", "Built", "Trained", "Optimized", "Deployed", "Led", "Automated",
+          "Worked on", "Was responsible for", "Helped with"]
+_OBJECTS = ["a recommendation engine", "data pipelines", "REST services", "an image super-resolution model",
+            "dashboards for sales analytics", "a chatbot", "CI pipelines", "a web scraping framework",
+            "fraud detection models", "internal tooling"]
+_OUTCOMES = ["reducing latency by 30%", "serving 2M users", "improving accuracy to 94%", "cutting costs by 18%",
+             "for 12 enterprise clients", "across 4 teams"]
+_FILLER = ("The team was focused on delivery and the work was reviewed weekly. Requirements were gathered "
+           "from stakeholders and the results were presented to leadership.").split()
+_DEGREES = ["B.Tech in Computer Engineering", "Bachelor of Science, Computer Science", "Master of Data Science",
+            "Diploma in Information Technology"]
+_SCHOOLS = ["Gujarat Technological University", "University of Mumbai", "Nirma University", "State College"]
+
+# ---- minimal PDF writer ----
+def _esc(s):
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def _page_stream(blocks, font_size):
+    """blocks: [(x, lines)]; every block starts at the top of the page."""
+    lead = font_size + 3
+    parts = []
+    for x, lines in blocks:
+        parts.append(f"BT /F1 {font_size} Tf {lead} TL {x} 760 Td")
+        parts.extend(f"({_esc(l)}) Tj T*" for l in lines)
+        parts.append("ET")
+    return "\n".join(parts).encode("latin-1", "replace")
+
+def make_pdf(pages, columns=1, font_size=10):
+    """pages: list of lists of lines. columns=2 splits each page into two side-by-side blocks."""
+    objs = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    kids = []
+    width = 48 if columns == 2 else 100
+    for lines in pages:
+        lines = [w for l in lines for w in (textwrap.wrap(l, width) or [""])]
+        if columns == 2:
+            half = (len(lines) + 1) // 2
+            blocks = [(40, lines[:half]), (310, lines[half:])]
+        else:
+            blocks = [(50, lines)]
+        stream = _page_stream(blocks, font_size)
+        objs.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objs.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                    b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objs))
+        kids.append(len(objs))
+    objs[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), len(kids))
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, o in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + o + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)
+    return bytes(out)
+
+# ---- synthetic content ----
+def synth_resume(rng, n_pages=1, skill_density=0.3, lines_per_page=48):
+    """Resume as a list of pages (lists of lines). skill_density ~ share of bullets naming skills."""
+    name = f"{rng.choice(_FIRST)} {rng.choice(_LAST)}"
+    skills = rng.sample(ALL_SKILLS, rng.randint(4, 14))
+    lines = [
+        name.upper() if rng.random() < 0.3 else name,
+        f"{name.split()[0].lower()}.{rng.randint(1, 99)}@example.com | +91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)} | {rng.choice(_CITIES)}",
+        "PROFESSIONAL SUMMARY",
+        f"Passionate engineer with {rng.randint(1, 12)} years of experience building {rng.choice(_OBJECTS)} "
+        f"using {', '.join(skills[:3])}.",
+        "SKILLS",
+        ", ".join(skills),
+        "EXPERIENCE",
+    ]
+    target = n_pages * lines_per_page - 8
+    while len(lines) < target:
+        r = rng.random()
+        if r < 0.08:
+            lines.append(f"{rng.choice(['Software Engineer', 'Data Scientist', 'ML Intern'])} - "
+                         f"{rng.choice(['Acme Corp', 'Globex', 'Initech'])} ({rng.randint(2015, 2023)} - {rng.randint(2019, 2025)})")
+        elif r < 0.08 + skill_density:
+            lines.append(f"- {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} with {' and '.join(rng.sample(skills, 2))}, "
+                         f"{rng.choice(_OUTCOMES)}.")
+        elif r < 0.9:
+            lines.append(" ".join(rng.choice(_FILLER) for _ in range(rng.randint(6, 16))) + ".")
+        else:
+            lines.append(f"PROJECTS" if rng.random() < 0.5 else f"{rng.choice(_OBJECTS).title()} (Flask, Docker)")
+    lines += ["EDUCATION", rng.choice(_DEGREES), f"{rng.choice(_SCHOOLS)}  {rng.randint(2012, 2020)}-{rng.randint(2016, 2024)}",
+              f"CGPA: {rng.randint(60, 99) / 10}", "CERTIFICATIONS", "AWS Certified Cloud Practitioner"]
+    return [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+def synth_jd(rng, n_skills=None):
+    skills = rng.sample(ALL_SKILLS, n_skills or rng.randint(3, 10))
+    role = rng.choice(["Machine Learning Engineer", "Backend Developer", "Data Analyst", "Full Stack Engineer"])
+    return (f"We are hiring a {role}. Required skills: {', '.join(skills)}. "
+            f"You will design and deploy production systems, collaborate with product teams and mentor juniors. "
+            f"Experience with {skills[0]} in production is a must.")
+
+def generate_corpus(out_dir, n_resumes=50, n_jds=10, seed=0):
+    """Write resumes/*.pdf and jds.json; returns the manifest (also written to manifest.json)."""
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(out_dir, "resumes"), exist_ok=True)
+    manifest = {"seed": seed, "resumes": [], "jds": "jds.json"}
+    for i in range(n_resumes):
+        pages = rng.choice([1, 1, 2, 2, 3, 5])
+        columns = rng.choice([1, 1, 2])
+        density = rng.choice([0.1, 0.3, 0.6])
+        content = synth_resume(rng, pages, density)
+        fn = f"resume_{i:05d}.pdf"
+        with open(os.path.join(out_dir, "resumes", fn), "wb") as f:
+            f.write(make_pdf(content, columns=columns, font_size=rng.choice([9, 10, 11])))
+        manifest["resumes"].append({"file": fn, "pages": len(content), "columns": columns, "skill_density": density})
+    with open(os.path.join(out_dir, "jds.json"), "w") as f:
+        json.dump([synth_jd(rng) for _ in range(n_jds)], f, indent=1)
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate a deterministic synthetic resume/JD corpus.")
+    ap.add_argument("out_dir")
+    ap.add_argument("--resumes", type=int, default=50)
+    ap.add_argument("--jds", type=int, default=10)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    m = generate_corpus(args.out_dir, args.resumes, args.jds, args.seed)
+    print(f"wrote {len(m['resumes'])} resumes and {args.jds} JDs to {args.out_dir}")
+
+if __name__ == "__main__":
+    main()
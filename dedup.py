@@ -0,0 +1,118 @@
+"""
+Near-duplicate resume detection with word shingles, MinHash and LSH banding.
+
+    dd = NearDuplicateIndex(threshold=0.85)
+    dup_of = dd.add("cand-17.pdf", cleaned_text)   # None, or the id it duplicates
+
+Each add costs O(shingles + bands) and only documents sharing an LSH bucket are
+compared. A duplicate is not put into buckets its cluster already occupies, so a
+large cluster of clones is compared against once per add, not once per member.
+"""
+import zlib
+
+import numpy as np
+
+_PRIME = (1 << 31) - 1
+
+def shingles(text, k=5):
+    """Hashes of the lower-cased word k-grams of text (a clean_text() output)."""
+    words = (text or "").lower().split()
+    if len(words) < k:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = (" ".join(words[i:i + k]) for i in range(len(words) - k + 1))
+    return np.fromiter({zlib.crc32(g.encode("utf-8")) for g in grams}, dtype=np.uint64)
+
+def choose_bands(threshold, num_perm):
+    """(bands, rows) with bands * rows <= num_perm whose LSH S-curve threshold is closest to `threshold`."""
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        t = (1.0 / bands) ** (1.0 / rows)
+        if best is None or abs(t - threshold) < best[0]:
+            best = (abs(t - threshold), bands, rows)
+    return best[1], best[2]
+
+class NearDuplicateIndex:
+    def __init__(self, threshold=0.85, num_perm=128, shingle_size=5, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+        self.bands, self.rows = choose_bands(threshold, num_perm)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._sigs = {}
+        self._parent = {}
+
+    def signature(self, text):
+        sh = shingles(text, self.shingle_size)
+        if len(sh) == 0:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        # (a * x + b) mod p for every permutation and shingle; x < 2^32 and a < 2^31 fit in uint64
+        return ((np.outer(self._a, sh) + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def _band_keys(self, sig):
+        r = self.rows
+        return [sig[i * r:(i + 1) * r].tobytes() for i in range(self.bands)]
+
+    def similarity(self, id1, id2):
+        """Estimated Jaccard similarity of two indexed documents."""
+        return float(np.mean(self._sigs[id1] == self._sigs[id2]))
+
+    def find(self, doc_id):
+        """Representative id of doc_id's near-duplicate cluster."""
+        p = self._parent
+        root = doc_id
+        while p[root] != root:
+            root = p[root]
+        while p[doc_id] != root:
+            p[doc_id], doc_id = root, p[doc_id]
+        return root
+
+    def query(self, text):
+        """
+        Indexed ids whose estimated similarity to text reaches the threshold, best
+        first. Duplicates are mostly represented by an earlier member of their cluster.
+        """
+        return self._candidates(self.signature(text))
+
+    def _candidates(self, sig):
+        seen = set()
+        for band, key in zip(self._buckets, self._band_keys(sig)):
+            seen.update(band.get(key, ()))
+        scored = [(float(np.mean(self._sigs[c] == sig)), c) for c in seen]
+        return [c for s, c in sorted(scored, key=lambda x: -x[0]) if s >= self.threshold]
+
+    def add(self, doc_id, text):
+        """Index a document; returns the cluster representative it duplicates, or None."""
+        if doc_id in self._sigs:
+            raise ValueError(f"{doc_id!r} already indexed")
+        sig = self.signature(text)
+        matches = self._candidates(sig)
+        self._sigs[doc_id] = sig
+        self._parent[doc_id] = doc_id
+        for band, key in zip(self._buckets, self._band_keys(sig)):
+            # a duplicate only claims band keys no earlier document holds
+            if not matches or key not in band:
+                band.setdefault(key, []).append(doc_id)
+        if not matches:
+            return None
+        root = self.find(matches[0])
+        for m in matches[1:]:
+            r = self.find(m)
+            if r != root:
+                self._parent[r] = root
+        self._parent[doc_id] = root
+        return root
+
+    def clusters(self, min_size=2):
+        """{representative: [member ids]} for clusters with at least min_size members."""
+        groups = {}
+        for d in self._sigs:
+            groups.setdefault(self.find(d), []).append(d)
+        return {k: v for k, v in groups.items() if len(v) >= min_size}
+
+    def __len__(self):
+        return len(self._sigs)
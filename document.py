@@ -0,0 +1,109 @@
+import re
+from functools import cached_property
+
+_SECTION_HEADERS = [
+    "summary", "profile", "professional summary", "objective",
+    "education", "experience", "projects", "skills",
+    "certifications", "work experience", "achievements", "projects", "education:"
+]
+
+_WORD_RE = re.compile(r'\b[a-zA-Z-]+\b')
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+def _is_section_header(line):
+    if not line:
+        return False
+    low = line.lower().strip().rstrip(':')
+    if low in _SECTION_HEADERS:
+        return True
+    for h in _SECTION_HEADERS:
+        if low.startswith(h + " ") or low.startswith(h + ":"):
+            return True
+    if line.strip().isupper() and len(line.strip()) < 40:
+        return True
+    return False
+
+class AnalyzedDocument:
+    """
+    One resume's text, analysed once and shared by the overview, ATS and matcher
+    code. Every view is computed lazily on first access and then reused.
+    """
+
+    def __init__(self, text):
+        self.text = text or ""
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def lines(self):
+        """Stripped, non-empty lines."""
+        return [ln.strip() for ln in self.text.split("\n") if ln.strip()]
+
+    @cached_property
+    def lower_lines(self):
+        return [ln.lower() for ln in self.lines]
+
+    @cached_property
+    def words(self):
+        """Whitespace-split tokens of the lower-cased text."""
+        return self.lower.split()
+
+    @cached_property
+    def tokens(self):
+        """Alphabetic word tokens (letters and hyphens) of the lower-cased text."""
+        return _WORD_RE.findall(self.lower)
+
+    @cached_property
+    def sentences(self):
+        return [s for s in _SENT_SPLIT_RE.split(self.text) if s.strip()]
+
+    @cached_property
+    def header_lines(self):
+        """Indices into .lines that look like section headers."""
+        return frozenset(i for i, ln in enumerate(self.lines) if _is_section_header(ln))
+
+    @cached_property
+    def sections(self):
+        """[(header line or None, first line index, end line index)] covering every line."""
+        out = []
+        start, header = 0, None
+        for i in sorted(self.header_lines):
+            if i > start or header is not None:
+                out.append((header, start, i))
+            header, start = self.lines[i], i + 1
+        if start < len(self.lines) or header is not None:
+            out.append((header, start, len(self.lines)))
+        return out
+
+    def top_text(self, f=0.3):
+        """The first fraction f of the lower-cased words, re-joined with single spaces."""
+        cache = self.__dict__.setdefault("_top", {})
+        if f not in cache:
+            w = self.words
+            cache[f] = " ".join(w[:int(len(w) * f)])
+        return cache[f]
+
+def section_chunks(text, max_words=150):
+    """
+    Split a resume into embedding-sized chunks along its section headers. Each
+    section is cut into pieces of at most max_words words, prefixed with its header
+    so the chunk keeps its context. Unchanged sections give identical chunk texts,
+    so cached vectors are reused across resume revisions.
+    """
+    doc = as_document(text)
+    chunks = []
+    for header, start, end in doc.sections:
+        words = " ".join(doc.lines[start:end]).split()
+        prefix = header.rstrip(":") + ": " if header else ""
+        if not words:
+            if header:
+                chunks.append(header)
+            continue
+        for i in range(0, len(words), max_words):
+            chunks.append(prefix + " ".join(words[i:i + max_words]))
+    return chunks
+
+def as_document(text):
+    return text if isinstance(text, AnalyzedDocument) else AnalyzedDocument(text)
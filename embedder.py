@@ -1,33 +1,160 @@
+import importlib.util
+import os
+import threading
+
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from src import metrics
+
+# sentence-transformers (and torch) are only imported when a model is first needed
+USE_SBERT = importlib.util.find_spec("sentence_transformers") is not None
+
+_models = {}
+_models_lock = threading.Lock()
+_default_tfidf = None
+# saved TfidfEngine (python -m src.tfidf_engine fit ...) used by the tf-idf fallback
+TFIDF_ENGINE_PATH = os.environ.get("RESUME_TFIDF_ENGINE")
 
-try:
-    from sentence_transformers import SentenceTransformer
-    USE_SBERT = True
-    _model = None
-except:
-    USE_SBERT = False
-    _model = None
+def load_model(name="all-MiniLM-L6-v2"):
+    """The process-wide SentenceTransformer for `name`, loaded on first call."""
+    model = _models.get(name)
+    if model is None:
+        with _models_lock:
+            model = _models.get(name)
+            if model is None:
+                from sentence_transformers import SentenceTransformer
+                model = _models[name] = SentenceTransformer(name)
+    return model
+
+def _shared_tfidf():
+    global _default_tfidf
+    if _default_tfidf is None:
+        from src.tfidf_engine import TfidfEngine
+        _default_tfidf = TfidfEngine.load(TFIDF_ENGINE_PATH) if TFIDF_ENGINE_PATH else TfidfEngine()
+    return _default_tfidf
 
 class TextEmbedder:
-    def __init__(self, name="all-MiniLM-L6-v2"):
-        global _model
-        if USE_SBERT:
-            if _model is None:
-                _model = SentenceTransformer(name)
-            self.model = _model
-        else:
-            self.model = None
+    def __init__(self, name="all-MiniLM-L6-v2", batch_size=256, cache=None, backend=None, tfidf=None, parallel=None):
+        """
+        backend: None (sentence-transformers if installed), "sbert" or "tfidf".
+        tfidf: TfidfEngine or path to a saved one, used by the tfidf backend;
+               defaults to the engine saved at RESUME_TFIDF_ENGINE, else a shared
+               (unfitted) hashing engine.
+        parallel: src.parallel_encode.ParallelEncoder to shard sentence-transformers
+                  encodes across worker processes (its model name should match `name`).
+        """
+        self.name = name
+        self.batch_size = batch_size
+        # optional src.embedding_cache.EmbeddingCache; only used with sentence-transformers
+        self.cache = cache
+        self.use_sbert = USE_SBERT if backend is None else backend == "sbert"
+        self._tfidf = tfidf
+        self.parallel = parallel
+
+    @property
+    def model(self):
+        return load_model(self.name) if self.use_sbert else None
+
+    @property
+    def tfidf(self):
+        if self.use_sbert:
+            return None
+        if self._tfidf is None:
+            self._tfidf = _shared_tfidf()
+        elif isinstance(self._tfidf, str):
+            from src.tfidf_engine import TfidfEngine
+            self._tfidf = TfidfEngine.load(self._tfidf)
+        return self._tfidf
+
+    def warm_up(self):
+        """Load the model (or tf-idf engine) and run one encode so the first request pays nothing."""
+        self.encode(["warm up"])
+        return self
+
+    def _encode(self, texts):
+        if self.parallel is not None:
+            return self.parallel.encode(texts)
+        return self.model.encode(
+            list(texts), batch_size=self.batch_size, convert_to_numpy=True,
+            normalize_embeddings=True, show_progress_bar=False
+        ).astype(np.float32, copy=False)
 
+    @metrics.timed("encode")
+    def encode(self, texts):
+        """Encode texts in batches; rows are L2-normalised so dot product == cosine."""
+        texts = list(texts)
+        if not self.use_sbert:
+            # sparse CSR rows from the tf-idf engine
+            return self.tfidf.transform(texts)
+        if self.cache is None:
+            return self._encode(texts)
+        cached = [self.cache.get(t) for t in texts]
+        todo = [i for i, v in enumerate(cached) if v is None]
+        if todo:
+            # encode each distinct missing text once, even if repeated in the batch
+            uniq = list(dict.fromkeys(texts[i] for i in todo))
+            fresh = dict(zip(uniq, self._encode(uniq)))
+            self.cache.put_many(uniq, [fresh[t] for t in uniq])
+            for i in todo:
+                cached[i] = fresh[texts[i]]
+        return np.vstack(cached) if cached else np.zeros((0, 0), dtype=np.float32)
+
+    @staticmethod
+    @metrics.timed("similarity")
+    def vector_similarity(v1, v2):
+        """Cosine of two encode() rows (dense or sparse), clipped to [0, 1]."""
+        # encode() rows are unit length, so the dot product is the cosine
+        sim = v1.multiply(v2).sum() if hasattr(v1, "multiply") else float(v1 @ v2)
+        return float(max(0, min(1, sim)))
+
+    # encode and vector_similarity record their own latencies
     def similarity(self, text1, text2):
-        if USE_SBERT and self.model:
-            v1 = self.model.encode([text1], convert_to_numpy=True)[0]
-            v2 = self.model.encode([text2], convert_to_numpy=True)[0]
+        vecs = self.encode([text1, text2])
+        return self.vector_similarity(vecs[0], vecs[1])
+
+    @staticmethod
+    def _row_scores(q, m):
+        s = m @ q.T
+        return np.asarray(s.toarray() if hasattr(s, "toarray") else s).ravel()
+
+    @metrics.timed("chunked_similarity")
+    def chunked_similarity(self, resume_text, jd_text, agg="max", max_words=150):
+        """
+        Score the JD against each section chunk of the resume instead of one truncated
+        string. All chunks are encoded in one call (and cached per chunk when a cache is
+        set); agg is "max" or "mean" over the chunk scores.
+        """
+        return float(self.chunked_similarities(jd_text, [resume_text], agg, max_words)[0])
+
+    @metrics.timed("chunked_similarities")
+    def chunked_similarities(self, query, texts, agg="max", max_words=150):
+        """chunked_similarity of one query against many resumes, all chunks in one encode call."""
+        from src.document import section_chunks
+        chunked = [section_chunks(t, max_words) or [t or ""] for t in texts]
+        if not chunked:
+            return np.zeros(0, dtype=np.float32)
+        flat = [c for chunks in chunked for c in chunks]
+        vecs = self.encode([query] + flat)
+        sims = np.clip(self._row_scores(vecs[0:1], vecs[1:]), 0, 1)
+        starts = np.cumsum([0] + [len(c) for c in chunked[:-1]])
+        if agg == "mean":
+            return np.add.reduceat(sims, starts) / np.array([len(c) for c in chunked])
+        if agg == "max":
+            return np.maximum.reduceat(sims, starts)
+        raise ValueError(f"unknown aggregation {agg!r}")
+
+    @metrics.timed("similarities")
+    def similarities(self, query, texts):
+        """Cosine similarity of one query against many texts, clipped to [0, 1]."""
+        texts = list(texts)
+        if not texts:
+            return np.zeros(0, dtype=np.float32)
+        if self.use_sbert:
+            q = self.encode([query])[0]
+            sims = self.encode(texts) @ q
         else:
-            from sklearn.feature_extraction.text import TfidfVectorizer
-            tfidf = TfidfVectorizer()
-            vecs = tfidf.fit_transform([text1, text2]).toarray()
-            v1, v2 = vecs[0], vecs[1]
+            sims = self.tfidf.score(query, self.tfidf.transform(texts))
+        return np.clip(sims, 0, 1)
 
-        sim = cosine_similarity([v1], [v2])[0][0]
-        return float(max(0, min(1, sim)))
+def warm_up(name="all-MiniLM-L6-v2", backend=None):
+    """Server start-up hook: import heavy dependencies and load the shared model now."""
+    return TextEmbedder(name, backend=backend).warm_up()
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from src import metrics
+
+def _normalize(text):
+    return " ".join((text or "").split())
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache: bounded in-memory LRU in front of an
+    optional on-disk store (append-only float32 matrix + key index, memory-mapped).
+    Keys are sha256(model name + normalised text), so edits to whitespace only
+    still hit and different models never collide.
+    """
+
+    def __init__(self, model_name, max_items=10000, path=None):
+        self.model_name = model_name
+        self.max_items = max_items
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._dim = None
+        self._mm = None
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._load_index()
+
+    # ---- keys ----
+    def key(self, text):
+        h = hashlib.sha256()
+        h.update(self.model_name.encode("utf-8"))
+        h.update(b"\0")
+        h.update(_normalize(text).encode("utf-8"))
+        return h.hexdigest()
+
+    # ---- disk tier ----
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _load_index(self):
+        meta = self._file("meta.json")
+        if not os.path.exists(meta):
+            return
+        with open(meta) as f:
+            m = json.load(f)
+        if m.get("model") != self.model_name:
+            raise ValueError(f"cache at {self.path} belongs to model {m.get('model')!r}")
+        self._dim = m["dim"]
+        keys_path, vec_path = self._file("keys.txt"), self._file("vectors.f32")
+        raw = ""
+        if os.path.exists(keys_path):
+            with open(keys_path, encoding="utf-8") as f:
+                raw = f.read()
+        # a torn last line (no newline) was never committed
+        keys = raw.split("\n")[:-1]
+        row_bytes = self._dim * 4
+        have = os.path.getsize(vec_path) // row_bytes if os.path.exists(vec_path) else 0
+        keys = keys[:have]
+        committed = "".join(k + "\n" for k in keys)
+        if committed != raw:
+            with open(keys_path, "w", encoding="utf-8") as f:
+                f.write(committed)
+        # a crash between the two writes leaves vector bytes past the last key; drop them
+        with open(vec_path, "ab") as f:
+            f.truncate(len(keys) * row_bytes)
+        self._rows = {k: i for i, k in enumerate(keys)}
+
+    def _matrix(self):
+        if self._mm is None or len(self._mm) < len(self._rows):
+            self._mm = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r",
+                                 shape=(len(self._rows), self._dim)) if self._rows else None
+        return self._mm
+
+    def _disk_get(self, k):
+        row = self._rows.get(k)
+        if row is None:
+            return None
+        return np.array(self._matrix()[row])
+
+    def _disk_put(self, items):
+        if self._dim is None:
+            self._dim = int(items[0][1].shape[0])
+            with open(self._file("meta.json"), "w") as f:
+                json.dump({"model": self.model_name, "dim": self._dim}, f)
+        items = [(k, v) for k, v in items if k not in self._rows]
+        if not items:
+            return
+        # write at the offset of the next row rather than appending, so a failed
+        # earlier write can't shift every later row
+        with open(self._file("vectors.f32"), "r+b" if self._rows else "wb") as f:
+            f.seek(len(self._rows) * self._dim * 4)
+            for _, v in items:
+                f.write(np.asarray(v, dtype=np.float32).tobytes())
+            f.truncate()
+        with open(self._file("keys.txt"), "a") as f:
+            for k, _ in items:
+                f.write(k + "\n")
+        for k, _ in items:
+            self._rows[k] = len(self._rows)
+
+    # ---- memory tier ----
+    def _remember(self, k, v):
+        self._lru[k] = v
+        self._lru.move_to_end(k)
+        while len(self._lru) > self.max_items:
+            self._lru.popitem(last=False)
+            self.evictions += 1
+            metrics.inc("resume_embedding_cache_total", result="eviction")
+
+    def get(self, text):
+        k = self.key(text)
+        with self._lock:
+            v = self._lru.get(k)
+            if v is not None:
+                self._lru.move_to_end(k)
+                self.hits += 1
+                metrics.inc("resume_embedding_cache_total", result="hit", tier="memory")
+                return v
+            if self.path:
+                v = self._disk_get(k)
+                if v is not None:
+                    self._remember(k, v)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    metrics.inc("resume_embedding_cache_total", result="hit", tier="disk")
+                    return v
+            self.misses += 1
+            metrics.inc("resume_embedding_cache_total", result="miss")
+            return None
+
+    def put_many(self, texts, vectors):
+        items = [(self.key(t), np.asarray(v, dtype=np.float32)) for t, v in zip(texts, vectors)]
+        if not items:
+            return
+        with self._lock:
+            for k, v in items:
+                self._remember(k, v)
+            if self.path:
+                self._disk_put(items)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "memory_items": len(self._lru),
+            "disk_items": len(self._rows),
+        }
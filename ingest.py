@@ -0,0 +1,223 @@
+"""
+Bulk resume ingestion: parse a directory or archive of PDFs across all cores.
+
+    python -m src.ingest resumes/ -o parsed.jsonl --workers 8 --chunksize 4
+    python -m src.ingest applicants.zip -o parsed.parquet
+
+Each PDF goes through parse_resume + generate_overview in a worker process;
+records are written as they finish and a throughput summary is printed at the end.
+Sources are read only a few chunks per worker ahead of the parsers, so an archive
+is never held in memory whole.
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from src.resume_parser import PDF_MAX_CHARS, PDF_MAX_PAGES, PDF_TIMEOUT, generate_overview, parse_resume
+
+# per-document limits, set in each worker by _init_worker
+_limits = {}
+
+def _init_worker(limits, max_memory_mb):
+    _limits.update(limits)
+    if max_memory_mb:
+        import resource
+        cap = int(max_memory_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (cap, cap))
+
+def iter_sources(path):
+    """Yield (name, path or bytes) for every PDF under a directory or inside a zip/tar archive."""
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for fn in sorted(files):
+                if fn.lower().endswith(".pdf"):
+                    full = os.path.join(root, fn)
+                    yield os.path.relpath(full, path), full
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(".pdf"):
+                    yield info.filename, zf.read(info)
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path) as tf:
+            for member in tf:
+                if member.isfile() and member.name.lower().endswith(".pdf"):
+                    yield member.name, tf.extractfile(member).read()
+    elif path.lower().endswith(".pdf"):
+        yield os.path.basename(path), path
+    else:
+        raise ValueError(f"not a directory, archive or PDF: {path}")
+
+def process_one(item, overview=True):
+    name, src = item
+    t0 = time.perf_counter()
+    try:
+        if isinstance(src, bytes):
+            resume = parse_resume(io.BytesIO(src), **_limits)
+        else:
+            with open(src, "rb") as f:
+                resume = parse_resume(f, **_limits)
+        if not resume["raw_text"]:
+            raise ValueError(f"no text extracted ({resume['truncated'] or 'empty document'})")
+        rec = {
+            "source": name, "ok": True, "pages": resume["pages"], "chars": len(resume["raw_text"]),
+            "truncated": resume["truncated"], "skills": resume["skills"], "raw_text": resume["raw_text"],
+        }
+        if overview:
+            rec["overview"] = generate_overview(resume["raw_text"], resume["skills"])
+        rec["seconds"] = round(time.perf_counter() - t0, 4)
+        return rec
+    except Exception as e:
+        return {"source": name, "ok": False, "error": f"{type(e).__name__}: {e}",
+                "seconds": round(time.perf_counter() - t0, 4)}
+
+def _process_chunk(items):
+    return [process_one(item) for item in items]
+
+def _chunks(items, size):
+    it = iter(items)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
+
+class JsonlWriter:
+    def __init__(self, path):
+        self.f = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+
+    def write(self, rec):
+        self.f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+    def close(self):
+        if self.f is not sys.stdout:
+            self.f.close()
+
+class ParquetWriter:
+    """Buffers records into row groups; requires pyarrow."""
+    COLUMNS = ["source", "ok", "error", "pages", "chars", "truncated", "duplicate_of", "skills", "raw_text", "overview", "seconds"]
+
+    def __init__(self, path, row_group=500):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.schema = pa.schema([
+            ("source", pa.string()), ("ok", pa.bool_()), ("error", pa.string()),
+            ("pages", pa.int32()), ("chars", pa.int64()), ("truncated", pa.string()), ("duplicate_of", pa.string()), ("skills", pa.list_(pa.string())),
+            ("raw_text", pa.string()), ("overview", pa.string()), ("seconds", pa.float64()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.row_group = row_group
+        self.buf = []
+
+    def write(self, rec):
+        self.buf.append(rec)
+        if len(self.buf) >= self.row_group:
+            self.flush()
+
+    def flush(self):
+        if self.buf:
+            cols = {c: [r.get(c) for r in self.buf] for c in self.COLUMNS}
+            self.writer.write_table(self.pa.table(cols, schema=self.schema))
+            self.buf = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+def open_writer(path):
+    if path.lower().endswith(".parquet"):
+        return ParquetWriter(path)
+    return JsonlWriter(path)
+
+def ingest(source, output, workers=None, chunksize=4, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS,
+           timeout=PDF_TIMEOUT, max_memory_mb=None, dedup_threshold=None, skip_duplicates=False, log=sys.stderr):
+    workers = workers or os.cpu_count() or 1
+    dedup = None
+    if dedup_threshold:
+        from src.dedup import NearDuplicateIndex
+        dedup = NearDuplicateIndex(dedup_threshold)
+    limits = {"max_pages": max_pages, "max_chars": max_chars, "timeout": timeout}
+    writer = open_writer(output)
+    docs = pages = truncated = duplicates = 0
+    failures = []
+    t0 = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(limits, max_memory_mb)) as pool:
+            chunks = _chunks(iter_sources(source), chunksize)
+            inflight = {}
+            try:
+                while True:
+                    # at most two chunks per worker are read ahead of the parsers
+                    while len(inflight) < 2 * workers and (chunk := next(chunks, None)):
+                        inflight[pool.submit(_process_chunk, chunk)] = [name for name, _ in chunk]
+                    if not inflight:
+                        break
+                    finished, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        names = inflight.pop(fut)
+                        try:
+                            recs = fut.result()
+                        except Exception as e:  # worker died (memory cap, segfault)
+                            recs = [{"source": name, "ok": False, "error": f"{type(e).__name__}: {e}"} for name in names]
+                        for rec in recs:
+                            docs += 1
+                            if not rec["ok"]:
+                                failures.append((rec["source"], rec["error"]))
+                            else:
+                                pages += rec["pages"]
+                                truncated += bool(rec["truncated"])
+                                if dedup is not None:
+                                    rec["duplicate_of"] = dedup.add(rec["source"], rec["raw_text"])
+                                    if rec["duplicate_of"]:
+                                        duplicates += 1
+                                        if skip_duplicates:
+                                            continue
+                            writer.write(rec)
+            finally:
+                for fut in inflight:
+                    fut.cancel()
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - t0
+    summary = {
+        "docs": docs, "failed": len(failures), "truncated": truncated, "duplicates": duplicates,
+        "pages": pages, "seconds": round(elapsed, 2),
+        "docs_per_sec": round(docs / elapsed, 2) if elapsed else 0.0,
+        "pages_per_sec": round(pages / elapsed, 2) if elapsed else 0.0,
+        "workers": workers,
+    }
+    print(f"ingested {docs} docs ({pages} pages) in {summary['seconds']}s with {workers} workers: "
+          f"{summary['docs_per_sec']} docs/sec, {summary['pages_per_sec']} pages/sec, "
+          f"{len(failures)} failed, {truncated} truncated, {duplicates} near-duplicates", file=log)
+    for name, err in failures[:20]:
+        print(f"  FAILED {name}: {err}", file=log)
+    if len(failures) > 20:
+        print(f"  ... and {len(failures) - 20} more", file=log)
+    return summary
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Parse a directory or archive of resume PDFs in parallel.")
+    ap.add_argument("source", help="directory, .zip/.tar(.gz) archive or single PDF")
+    ap.add_argument("-o", "--output", default="-", help="output .jsonl or .parquet (default: JSONL to stdout)")
+    ap.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    ap.add_argument("--chunksize", type=int, default=4, help="PDFs handed to a worker at a time")
+    ap.add_argument("--max-pages", type=int, default=PDF_MAX_PAGES, help="stop extracting a PDF after this many pages")
+    ap.add_argument("--max-chars", type=int, default=PDF_MAX_CHARS, help="stop extracting a PDF after this many characters")
+    ap.add_argument("--timeout", type=float, default=PDF_TIMEOUT, help="wall-clock seconds per PDF (0 disables)")
+    ap.add_argument("--max-memory-mb", type=int, default=None, help="address-space cap per worker process")
+    ap.add_argument("--dedup-threshold", type=float, default=None,
+                    help="flag near-duplicates above this estimated Jaccard similarity (e.g. 0.85)")
+    ap.add_argument("--skip-duplicates", action="store_true", help="do not write records flagged as near-duplicates")
+    args = ap.parse_args(argv)
+    summary = ingest(args.source, args.output, args.workers, args.chunksize, args.max_pages, args.max_chars,
+                     args.timeout or None, args.max_memory_mb, args.dedup_threshold, args.skip_duplicates)
+    return 1 if summary["docs"] and summary["failed"] == summary["docs"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
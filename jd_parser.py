@@ -1,14 +1,16 @@
 import re
-from src.skills_db import ALL_SKILLS
+from src import metrics
+from src.skill_matcher import default_matcher
 
 def clean_text(t):
     t = t.replace("\t", " ")
     return re.sub(r"\s+", " ", t).strip()
 
 def extract_skills_from_jd(t):
-    t = t.lower()
-    return sorted({s for s in ALL_SKILLS if s in t})
+    return default_matcher().find(t)
 
+@metrics.timed("parse_jd")
 def parse_jd(t):
     c = clean_text(t)
+    metrics.inc("resume_chars_total", len(c), stage="parse_jd")
     return {"raw_text": c, "required_skills": extract_skills_from_jd(c)}
@@ -0,0 +1,342 @@
+"""
+Resumable bulk scoring: every resume in a directory or archive against a set of JDs.
+
+    python -m src.job_runner resumes/ --jd jds/ -o scores.jsonl --workers 8 --batch-size 64
+    python -m src.job_runner applicants.zip --jd backend.txt --jd frontend.txt -o scores.jsonl
+
+Stages run concurrently and hand work on through bounded queues, so a slow
+stage holds back the ones before it instead of letting results pile up in
+memory:
+
+    parse (process pool) -> embed (batched encode) -> score (batch ATS) -> write
+
+Each resume yields one JSONL row per JD (or a single error row). After every
+written batch the output is fsynced and the finished sources are appended to
+a checkpoint file (default: <output>.ckpt) together with the output size.
+Re-running the same command skips those sources and truncates anything
+written after the last checkpoint, so a killed run resumes without duplicate
+or partial rows. A checkpoint from a different JD set or embedding backend
+is refused.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from src.ats_batch import batch_ats_scores
+from src.embedder import TextEmbedder
+from src.ingest import _init_worker, iter_sources, process_one
+from src.jd_parser import parse_jd
+from src.matcher import compute_overall_score, compute_skill_coverage
+from src.resume_parser import PDF_MAX_CHARS, PDF_MAX_PAGES
+from src.resume_store import _effective_version
+
+_DONE = object()
+
+def load_jds(paths):
+    """[(name, text)] from .txt files and/or directories of them."""
+    jds = []
+    for path in paths:
+        if os.path.isdir(path):
+            for fn in sorted(os.listdir(path)):
+                if fn.lower().endswith(".txt"):
+                    with open(os.path.join(path, fn), encoding="utf-8") as f:
+                        jds.append((fn, f.read()))
+        else:
+            with open(path, encoding="utf-8") as f:
+                jds.append((os.path.basename(path), f.read()))
+    if not jds:
+        raise ValueError("no job descriptions found")
+    return jds
+
+def job_fingerprint(jds, embedder, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS):
+    """Identity of everything that shapes the output; a checkpoint from a different job is refused."""
+    h = hashlib.sha256()
+    for name, text in jds:
+        h.update(name.encode() + b"\0" + text.encode() + b"\0")
+    # parser and taxonomy version, as in ResumeStore, plus the extraction limits
+    h.update(f"{embedder.name}\0{embedder.use_sbert}\0{_effective_version()}\0{max_pages}\0{max_chars}".encode())
+    return h.hexdigest()
+
+class Checkpoint:
+    """
+    Append-only JSONL: a header with the job fingerprint, then one line per
+    committed batch with its sources and the output size after it. A torn
+    last line (killed mid-append) is cut off on open.
+    """
+
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self.done = set()
+        self.offset = 0
+        committed = 0   # bytes of complete, decodable lines
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                lines = f.read().splitlines(keepends=True)
+            if lines and lines[0].endswith(b"\n"):
+                try:
+                    header = json.loads(lines[0])
+                except ValueError:
+                    raise ValueError(f"{path}: not a job checkpoint")
+                if header.get("fingerprint") != fingerprint:
+                    raise ValueError(f"{path} was written for different JDs or another embedding backend; "
+                                     "remove it or pick another output")
+                committed = len(lines[0])
+                for line in lines[1:]:
+                    try:
+                        entry = json.loads(line) if line.endswith(b"\n") else None
+                    except ValueError:
+                        entry = None
+                    if entry is None:
+                        break
+                    self.done.update(entry["sources"])
+                    self.offset = entry["offset"]
+                    committed += len(line)
+            if committed < sum(map(len, lines)):
+                # drop the torn tail, or the next entry would be glued onto it and lost
+                with open(path, "r+b") as f:
+                    f.truncate(committed)
+        self.f = open(path, "a", encoding="utf-8")
+        if not committed:
+            self._append({"fingerprint": fingerprint, "created": time.time()})
+
+    def _append(self, entry):
+        self.f.write(json.dumps(entry) + "\n")
+        self.f.flush()
+        os.fsync(self.f.fileno())
+
+    def commit(self, sources, offset):
+        self.done.update(sources)
+        self.offset = offset
+        self._append({"sources": sources, "offset": offset})
+
+    def close(self):
+        self.f.close()
+
+class JobRunner:
+    def __init__(self, jds, embedder=None, workers=None, batch_size=64, queue_size=None, linger=0.05,
+                 max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, timeout=60, max_memory_mb=None):
+        self.embedder = embedder or TextEmbedder()
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        # queued parse results; also bounds the resumes in flight in the pool
+        self.queue_size = queue_size or max(2 * batch_size, 4 * self.workers)
+        self.linger = linger
+        self.limits = {"max_pages": max_pages, "max_chars": max_chars, "timeout": timeout}
+        self.max_memory_mb = max_memory_mb
+        self.jd_names = [name for name, _ in jds]
+        self.jds = [parse_jd(text) for _, text in jds]
+        self.jd_vecs = self.embedder.encode([jd["raw_text"] for jd in self.jds])
+        self.fingerprint = job_fingerprint(jds, self.embedder, max_pages, max_chars)
+        self._stop = threading.Event()
+        self._errors = []
+        self.busy = {"parse": 0.0, "embed": 0.0, "score": 0.0, "write": 0.0}
+
+    # ---- queue helpers that give up once the job is stopping ----
+    def _put(self, q, item):
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _get(self, q, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._stop.is_set():
+            wait_for = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+            if wait_for <= 0:
+                raise queue.Empty
+            try:
+                return q.get(timeout=wait_for)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def _stage(self, fn, *args):
+        def run():
+            try:
+                fn(*args)
+            except BaseException as e:
+                self._errors.append(e)
+                self._stop.set()
+        t = threading.Thread(target=run, name=fn.__name__, daemon=True)
+        t.start()
+        return t
+
+    # ---- stages ----
+    def _feed(self, sources, done, out_q):
+        # spawn: this runs on a stage thread next to the embed/score/write threads
+        with ProcessPoolExecutor(self.workers, mp_context=mp.get_context("spawn"), initializer=_init_worker,
+                                 initargs=(self.limits, self.max_memory_mb)) as pool:
+            it = ((name, src) for name, src in sources if name not in done)
+            inflight = {}
+            exhausted = False
+            try:
+                while not self._stop.is_set():
+                    while not exhausted and len(inflight) < self.queue_size:
+                        item = next(it, None)
+                        if item is None:
+                            exhausted = True
+                        else:
+                            inflight[pool.submit(process_one, item, False)] = item[0]
+                    if not inflight:
+                        break
+                    finished, _ = wait(inflight, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        name = inflight.pop(fut)
+                        try:
+                            rec = fut.result()
+                        except Exception as e:  # worker died (memory cap, segfault)
+                            rec = {"source": name, "ok": False, "error": f"{type(e).__name__}: {e}"}
+                        self.busy["parse"] += rec.get("seconds", 0.0)
+                        # blocks while the embed stage is behind
+                        if not self._put(out_q, rec):
+                            return
+            finally:
+                for fut in inflight:
+                    fut.cancel()
+        self._put(out_q, _DONE)
+
+    def _embed(self, in_q, out_q):
+        finished = False
+        while not finished:
+            rec = self._get(in_q)
+            if rec is _DONE:
+                break
+            batch = [rec]
+            # fill the batch with whatever arrives within `linger`
+            while len(batch) < self.batch_size:
+                try:
+                    rec = self._get(in_q, self.linger)
+                except queue.Empty:
+                    break
+                if rec is _DONE:
+                    finished = True
+                    break
+                batch.append(rec)
+            t0 = time.perf_counter()
+            ok = [r for r in batch if r["ok"]]
+            sims = np.zeros((0, len(self.jds)))
+            if ok:
+                s = self.embedder.encode([r["raw_text"] for r in ok]) @ self.jd_vecs.T
+                sims = np.clip(np.asarray(s.toarray() if hasattr(s, "toarray") else s), 0, 1)
+            self.busy["embed"] += time.perf_counter() - t0
+            if not self._put(out_q, (batch, ok, sims)):
+                return
+        self._put(out_q, _DONE)
+
+    def _score(self, in_q, out_q):
+        jd_skills = [jd["required_skills"] for jd in self.jds]
+        while True:
+            item = self._get(in_q)
+            if item is _DONE:
+                break
+            batch, ok, sims = item
+            t0 = time.perf_counter()
+            ats = batch_ats_scores([r["raw_text"] for r in ok], jd_skills)["score"] if ok else None
+            rows = []
+            pos = {id(r): i for i, r in enumerate(ok)}
+            for r in batch:
+                if not r["ok"]:
+                    rows.append({"source": r["source"], "ok": False, "error": r["error"]})
+                    continue
+                i = pos[id(r)]
+                for j, jd in enumerate(self.jds):
+                    sem = float(sims[i, j])
+                    cov, matched, missing = compute_skill_coverage(r["skills"], jd["required_skills"])
+                    rows.append({
+                        "source": r["source"], "jd": self.jd_names[j], "ok": True,
+                        "overall_score": compute_overall_score(sem, cov), "ats_score": float(ats[i, j]),
+                        "semantic_similarity": round(sem, 4), "skill_coverage": round(cov, 4),
+                        "matched_skills": matched, "missing_skills": missing,
+                        "pages": r["pages"], "truncated": r["truncated"],
+                    })
+            self.busy["score"] += time.perf_counter() - t0
+            if not self._put(out_q, ([r["source"] for r in batch], rows)):
+                return
+        self._put(out_q, _DONE)
+
+    def run(self, source, output, checkpoint=None, log=sys.stderr):
+        ckpt = Checkpoint(checkpoint or output + ".ckpt", self.fingerprint)
+        if ckpt.offset and (not os.path.exists(output) or os.path.getsize(output) < ckpt.offset):
+            ckpt.close()
+            raise ValueError(f"{output} is shorter than its checkpoint says; it was modified or replaced")
+        out = open(output, "r+b" if ckpt.offset else "wb")
+        out.truncate(ckpt.offset)
+        out.seek(ckpt.offset)
+        skipped = len(ckpt.done)
+        docs = failed = rows_written = 0
+        parse_q, embed_q, write_q = (queue.Queue(self.queue_size), queue.Queue(4), queue.Queue(4))
+        t0 = time.perf_counter()
+        threads = [
+            self._stage(self._feed, iter_sources(source), frozenset(ckpt.done), parse_q),
+            self._stage(self._embed, parse_q, embed_q),
+            self._stage(self._score, embed_q, write_q),
+        ]
+        try:
+            while True:
+                item = self._get(write_q)
+                if item is _DONE:
+                    break
+                sources, rows = item
+                t1 = time.perf_counter()
+                out.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows).encode("utf-8"))
+                out.flush()
+                os.fsync(out.fileno())
+                ckpt.commit(sources, out.tell())
+                self.busy["write"] += time.perf_counter() - t1
+                docs += len(sources)
+                failed += sum(1 for r in rows if not r["ok"])
+                rows_written += len(rows)
+        finally:
+            self._stop.set()
+            for t in threads:
+                t.join()
+            out.close()
+            ckpt.close()
+        if self._errors:
+            raise self._errors[0]
+        elapsed = time.perf_counter() - t0
+        summary = {
+            "docs": docs, "skipped": skipped, "failed": failed, "rows": rows_written, "jds": len(self.jds),
+            "seconds": round(elapsed, 2), "docs_per_sec": round(docs / elapsed, 2) if elapsed else 0.0,
+            "workers": self.workers, "busy": {k: round(v, 2) for k, v in self.busy.items()},
+        }
+        print(f"scored {docs} resumes x {len(self.jds)} JDs in {summary['seconds']}s "
+              f"({summary['docs_per_sec']} resumes/sec, {skipped} already done, {failed} failed); "
+              f"stage busy seconds: " + ", ".join(f"{k} {v}" for k, v in summary["busy"].items()), file=log)
+        return summary
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Score every resume against a set of JDs; resumable.")
+    ap.add_argument("source", help="directory, .zip/.tar(.gz) archive or single PDF")
+    ap.add_argument("--jd", action="append", required=True, help="JD .txt file or directory of them (repeatable)")
+    ap.add_argument("-o", "--output", required=True, help="output .jsonl")
+    ap.add_argument("--checkpoint", help="checkpoint file (default: <output>.ckpt)")
+    ap.add_argument("-w", "--workers", type=int, default=None, help="parse processes (default: all cores)")
+    ap.add_argument("--batch-size", type=int, default=64, help="resumes per encode / ATS batch")
+    ap.add_argument("--queue-size", type=int, default=None, help="parsed resumes buffered ahead of the embed stage")
+    ap.add_argument("--backend", choices=["sbert", "tfidf"], default=None, help="embedding backend (default: sbert if installed)")
+    ap.add_argument("--max-pages", type=int, default=PDF_MAX_PAGES)
+    ap.add_argument("--max-chars", type=int, default=PDF_MAX_CHARS)
+    ap.add_argument("--timeout", type=float, default=60, help="wall-clock seconds per PDF (0 disables)")
+    ap.add_argument("--max-memory-mb", type=int, default=None, help="address-space cap per parse process")
+    args = ap.parse_args(argv)
+    runner = JobRunner(load_jds(args.jd), TextEmbedder(backend=args.backend), args.workers, args.batch_size,
+                       args.queue_size, max_pages=args.max_pages, max_chars=args.max_chars,
+                       timeout=args.timeout or None, max_memory_mb=args.max_memory_mb)
+    summary = runner.run(args.source, args.output, args.checkpoint)
+    return 1 if summary["docs"] and summary["failed"] == summary["docs"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
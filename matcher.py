@@ -1,7 +1,9 @@
 
+from src.skills_db import canonical_skill
+
 def compute_skill_coverage(resume_skills, jd_skills):
-    r=set([s.lower() for s in (resume_skills or [])])
-    j=set([s.lower() for s in (jd_skills or [])])
+    r=set([canonical_skill(s) for s in (resume_skills or [])])
+    j=set([canonical_skill(s) for s in (jd_skills or [])])
     matched=sorted(list(r&j))
     missing=sorted(list(j-r))
     cov=len(matched)/len(j) if j else 0
@@ -0,0 +1,130 @@
+"""
+Lightweight in-process instrumentation with Prometheus text exposition.
+
+Disabled unless RESUME_METRICS=1 (or enable() is called); when disabled every
+hook is a single flag check. Expose with write_textfile(path) (for the node
+exporter textfile collector) or serve(port) for a /metrics HTTP endpoint.
+"""
+import bisect
+import os
+import threading
+import time
+from functools import wraps
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_enabled = os.environ.get("RESUME_METRICS", "") not in ("", "0", "false")
+_lock = threading.Lock()
+_histograms = {}   # stage -> [bucket counts..., +Inf count], sum
+_counters = {}     # (name, sorted label items) -> value
+_servers = {}
+
+def enable(flag=True):
+    global _enabled
+    _enabled = bool(flag)
+
+def enabled():
+    return _enabled
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+def observe(stage, seconds):
+    if not _enabled:
+        return
+    with _lock:
+        h = _histograms.get(stage)
+        if h is None:
+            h = _histograms[stage] = [[0] * (len(BUCKETS) + 1), 0.0]
+        h[0][bisect.bisect_left(BUCKETS, seconds)] += 1
+        h[1] += seconds
+
+def inc(name, value=1, **labels):
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def timed(stage):
+    """Decorator recording latency into resume_stage_seconds{stage=...} and exceptions into errors."""
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            t = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                inc("resume_stage_errors_total", stage=stage)
+                raise
+            finally:
+                observe(stage, time.perf_counter() - t)
+        return wrapper
+    return deco
+
+def _labels(items):
+    if not items:
+        return ""
+    return "{" + ",".join('%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in items) + "}"
+
+def render():
+    """Current metrics in Prometheus text exposition format 0.0.4."""
+    out = []
+    with _lock:
+        if _histograms:
+            out.append("# HELP resume_stage_seconds Latency of pipeline stages.")
+            out.append("# TYPE resume_stage_seconds histogram")
+            for stage in sorted(_histograms):
+                counts, total = _histograms[stage]
+                cum = 0
+                for le, c in zip(BUCKETS, counts):
+                    cum += c
+                    out.append(f'resume_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cum}')
+                cum += counts[-1]
+                out.append(f'resume_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {cum}')
+                out.append(f'resume_stage_seconds_sum{{stage="{stage}"}} {total}')
+                out.append(f'resume_stage_seconds_count{{stage="{stage}"}} {cum}')
+        seen = set()
+        for (name, labels), value in sorted(_counters.items()):
+            if name not in seen:
+                seen.add(name)
+                out.append(f"# TYPE {name} counter")
+            out.append(f"{name}{_labels(labels)} {value}")
+    return "\n".join(out) + "\n"
+
+def write_textfile(path):
+    """Atomically write render() to path."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+def serve(port=9108, addr="0.0.0.0"):
+    """Serve /metrics on a daemon thread; idempotent per port."""
+    if port in _servers:
+        return _servers[port]
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _servers[port] = server
+    return server
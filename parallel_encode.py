@@ -0,0 +1,172 @@
+"""
+Multi-process CPU encoding with results written to shared memory.
+
+    enc = ParallelEncoder(workers=4, threads=2)
+    vecs = enc.encode(texts)                      # same rows as TextEmbedder().encode(texts)
+    emb = TextEmbedder(parallel=enc)              # or let TextEmbedder shard its encodes
+
+    python -m src.parallel_encode --texts 4000    # benchmark workers x threads splits
+
+One SentenceTransformer.encode call on short texts leaves most cores idle. Here
+each worker process loads the model once, runs torch with `threads` intra-op
+threads, and encodes contiguous shards of the batch straight into one
+shared-memory float32 array, so only shard offsets cross the process boundary.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+# per-worker state, set by _init_worker
+_model = None
+_batch_size = 64
+
+def _init_worker(name, threads, batch_size):
+    global _model, _batch_size
+    # must be set before torch creates its thread pools
+    os.environ["OMP_NUM_THREADS"] = os.environ["MKL_NUM_THREADS"] = str(threads)
+    import torch
+    torch.set_num_threads(threads)
+    from src.embedder import load_model
+    _model = load_model(name)
+    _batch_size = batch_size
+
+def _dimension():
+    return _model.get_sentence_embedding_dimension()
+
+def _encode_shard(shm_name, shape, start, texts):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        out[start:start + len(texts)] = _model.encode(
+            texts, batch_size=_batch_size, convert_to_numpy=True,
+            normalize_embeddings=True, show_progress_bar=False,
+        )
+        del out
+    finally:
+        shm.close()
+    return len(texts)
+
+class ParallelEncoder:
+    def __init__(self, name="all-MiniLM-L6-v2", workers=None, threads=1, batch_size=64, shards_per_worker=4):
+        """
+        workers: processes (default: cores // threads); threads: torch intra-op threads
+        per worker. Each batch is cut into about workers * shards_per_worker shards
+        so a slow shard doesn't leave the other workers idle at the end.
+        """
+        self.name = name
+        self.threads = threads
+        self.workers = workers or max(1, (os.cpu_count() or 1) // threads)
+        self.batch_size = batch_size
+        self.shards_per_worker = shards_per_worker
+        # spawn: forking a parent that already initialised torch can deadlock
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=get_context("spawn"), initializer=_init_worker,
+                                        initargs=(name, threads, batch_size))
+        self._dim = None
+
+    @property
+    def dim(self):
+        if self._dim is None:
+            self._dim = self.pool.submit(_dimension).result()
+        return self._dim
+
+    def warm_up(self):
+        """Start every worker and load its model now rather than on the first batch."""
+        for f in [self.pool.submit(_dimension) for _ in range(self.workers)]:
+            self._dim = f.result()
+        return self
+
+    def encode(self, texts):
+        """L2-normalised float32 rows, one per text, in input order."""
+        texts = list(texts)
+        shape = (len(texts), self.dim)
+        if not texts:
+            return np.zeros(shape, dtype=np.float32)
+        shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 4)
+        try:
+            step = max(1, math.ceil(len(texts) / (self.workers * self.shards_per_worker)))
+            futures = [self.pool.submit(_encode_shard, shm.name, shape, i, texts[i:i + step])
+                       for i in range(0, len(texts), step)]
+            for f in futures:
+                f.result()
+            return np.ndarray(shape, dtype=np.float32, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def candidate_splits(cores=None):
+    """(workers, threads) pairs that use every core, plus single-process baselines."""
+    cores = cores or os.cpu_count() or 1
+    splits = {(1, 1), (1, cores)}
+    for threads in range(1, cores + 1):
+        if cores % threads == 0:
+            splits.add((cores // threads, threads))
+    return sorted(splits)
+
+def benchmark(texts, name="all-MiniLM-L6-v2", splits=None, batch_size=64, repeat=2, log=sys.stderr):
+    """Texts/sec for each (workers, threads) split, best first; the model load is not timed."""
+    results = []
+    for workers, threads in splits or candidate_splits():
+        with ParallelEncoder(name, workers, threads, batch_size) as enc:
+            enc.warm_up()
+            best = min(_timed(enc.encode, texts) for _ in range(repeat))
+        r = {"workers": workers, "threads": threads, "seconds": round(best, 4),
+             "texts_per_sec": round(len(texts) / best, 1)}
+        print(f"workers={workers:<3} threads={threads:<3} {r['texts_per_sec']:>10} texts/sec", file=log)
+        results.append(r)
+    return sorted(results, key=lambda r: -r["texts_per_sec"])
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+def _bench_texts(n, seed=0):
+    """Short texts like the section chunks chunked similarity encodes."""
+    from src.bench_corpus import synth_resume
+    from src.document import section_chunks
+    rng = random.Random(seed)
+    texts = []
+    while len(texts) < n:
+        pages = synth_resume(rng, n_pages=rng.choice([1, 1, 2]))
+        texts.extend(section_chunks("\n".join(line for page in pages for line in page), max_words=60))
+    return texts[:n]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Find the fastest workers x threads split for CPU encoding.")
+    ap.add_argument("--model", default="all-MiniLM-L6-v2")
+    ap.add_argument("--texts", type=int, default=2000, help="number of synthetic short texts to encode")
+    ap.add_argument("--batch-size", type=int, default=64)
+    ap.add_argument("--repeat", type=int, default=2)
+    ap.add_argument("--split", action="append", metavar="WORKERSxTHREADS",
+                    help="only try these splits, e.g. --split 4x2 --split 8x1")
+    ap.add_argument("--out", help="write results JSON here")
+    args = ap.parse_args(argv)
+    splits = [tuple(int(x) for x in s.lower().split("x")) for s in args.split] if args.split else None
+    results = benchmark(_bench_texts(args.texts), args.model, splits, args.batch_size, args.repeat)
+    best = results[0]
+    print(f"best: {best['workers']} workers x {best['threads']} threads "
+          f"({best['texts_per_sec']} texts/sec on {os.cpu_count()} cores)")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"cores": os.cpu_count(), "texts": args.texts, "results": results}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
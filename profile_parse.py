@@ -0,0 +1,183 @@
+"""
+Profile the parse pipeline over a set of PDFs.
+
+    python -m src.profile_parse resumes/ --out prof/ --top 10
+    flamegraph.pl prof/stacks.collapsed > parse.svg      # or load it in speedscope
+
+Each PDF goes through debug_parse_file (quietly), with every stage (extract:
+the pdfplumber layout pass, clean, skills, overview) run under its own
+cProfile.Profile. Written to --out:
+
+    <stage>.prof       cProfile stats per stage, summed over all documents (pstats, snakeviz)
+    stacks.collapsed   sampled stacks in flamegraph collapsed format, rooted at the stage
+    documents.json     per-document pages, chars, per-stage seconds and errors
+
+The sampler is a background thread reading the main thread's frame from
+sys._current_frames() every --interval seconds. It measures wall time, so
+time blocked in pdfplumber I/O shows up too. A summary of the top functions
+per stage and the --top slowest documents is printed.
+"""
+import argparse
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+
+from src.ingest import iter_sources
+from src.resume_parser import debug_parse_file
+
+STAGES = ["extract", "clean", "skills", "overview"]
+
+class StackSampler:
+    """Collapsed stacks of one thread, sampled by a daemon thread."""
+
+    def __init__(self, thread_id, interval=0.001, root_code=None):
+        self.thread_id = thread_id
+        self.interval = interval
+        # frames at and above this code object (the profiler's own stage wrapper) are dropped
+        self.root_code = root_code
+        self.label = "other"
+        self.counts = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            label = self.label
+            stack = []
+            while frame is not None:
+                if frame.f_code is self.root_code:
+                    break
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            else:
+                if self.root_code is not None:
+                    continue  # between stages
+            key = ";".join([label] + stack[::-1])
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for key, n in sorted(self.counts.items()):
+                f.write(f"{key} {n}\n")
+
+class ParseProfiler:
+    def __init__(self, interval=0.001, cprofile=True):
+        self.profiles = {name: cProfile.Profile() for name in STAGES} if cprofile else {}
+        self.sampler = None
+        if interval:
+            self.sampler = StackSampler(threading.get_ident(), interval, self._run_stage.__code__)
+        self.documents = []
+        self._timings = None
+
+    def _run_stage(self, name, fn, *args):
+        prof = self.profiles.get(name)
+        if self.sampler:
+            self.sampler.label = name
+        t0 = time.perf_counter()
+        if prof:
+            prof.enable()
+        try:
+            return fn(*args)
+        finally:
+            if prof:
+                prof.disable()
+            self._timings[name] = self._timings.get(name, 0.0) + time.perf_counter() - t0
+
+    def profile_one(self, name, src):
+        self._timings = {}
+        doc = {"source": name}
+        t0 = time.perf_counter()
+        try:
+            f = io.BytesIO(src) if isinstance(src, bytes) else src
+            r = debug_parse_file(f, stage=self._run_stage, quiet=True)
+            doc.update(pages=r["pages"], chars=r["chars"], truncated=r["truncated"])
+        except Exception as e:
+            doc["error"] = f"{type(e).__name__}: {e}"
+        doc["seconds"] = round(time.perf_counter() - t0, 6)
+        doc["stages"] = {k: round(v, 6) for k, v in self._timings.items()}
+        self.documents.append(doc)
+        return doc
+
+    def run(self, sources):
+        if self.sampler:
+            self.sampler.start()
+        try:
+            for name, src in sources:
+                self.profile_one(name, src)
+        finally:
+            if self.sampler:
+                self.sampler.stop()
+        return self.documents
+
+    def slowest(self, n=10):
+        return sorted(self.documents, key=lambda d: -d["seconds"])[:n]
+
+    def write(self, out_dir):
+        os.makedirs(out_dir, exist_ok=True)
+        for name, prof in self.profiles.items():
+            prof.dump_stats(os.path.join(out_dir, f"{name}.prof"))
+        if self.sampler:
+            self.sampler.write(os.path.join(out_dir, "stacks.collapsed"))
+        with open(os.path.join(out_dir, "documents.json"), "w") as f:
+            json.dump(self.documents, f, indent=1)
+
+    def report(self, top=10, functions=8, log=sys.stdout):
+        total = sum(d["seconds"] for d in self.documents)
+        stage_totals = {s: sum(d["stages"].get(s, 0.0) for d in self.documents) for s in STAGES}
+        print(f"{len(self.documents)} documents in {total:.2f}s; by stage: "
+              + ", ".join(f"{s} {v:.2f}s ({100 * v / total if total else 0:.0f}%)" for s, v in stage_totals.items()),
+              file=log)
+        for name, prof in self.profiles.items():
+            if not stage_totals.get(name):
+                continue
+            print(f"\n----- {name}: top {functions} by cumulative time -----", file=log)
+            buf = io.StringIO()
+            pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(functions)
+            # drop pstats' preamble, keep the table
+            lines = buf.getvalue().splitlines()
+            start = next((i for i, l in enumerate(lines) if l.lstrip().startswith("ncalls")), 0)
+            print("\n".join(l for l in lines[start:] if l.strip()), file=log)
+        print(f"\n----- {min(top, len(self.documents))} slowest documents -----", file=log)
+        print(f"{'seconds':>8} {'pages':>5} {'chars':>8}  " + " ".join(f"{s:>9}" for s in STAGES) + "  source", file=log)
+        for d in self.slowest(top):
+            cells = " ".join(f"{d['stages'].get(s, 0.0):9.4f}" for s in STAGES)
+            note = f"  [{d['error']}]" if "error" in d else (f"  [truncated: {d['truncated']}]" if d.get("truncated") else "")
+            print(f"{d['seconds']:8.4f} {d.get('pages', '-'):>5} {d.get('chars', '-'):>8}  {cells}  {d['source']}{note}", file=log)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Profile resume parsing per stage and find the slowest documents.")
+    ap.add_argument("source", help="directory, .zip/.tar(.gz) archive or single PDF")
+    ap.add_argument("--out", default="parse_profile", help="directory for .prof files, collapsed stacks and documents.json")
+    ap.add_argument("--top", type=int, default=10, help="slowest documents to list")
+    ap.add_argument("--functions", type=int, default=8, help="functions to list per stage")
+    ap.add_argument("--interval", type=float, default=0.001, help="stack sampling interval in seconds (0 disables)")
+    ap.add_argument("--no-cprofile", action="store_true", help="sample stacks only (lower overhead timings)")
+    ap.add_argument("--limit", type=int, default=None, help="profile at most this many PDFs")
+    args = ap.parse_args(argv)
+    prof = ParseProfiler(args.interval, cprofile=not args.no_cprofile)
+    sources = iter_sources(args.source)
+    if args.limit:
+        sources = (s for _, s in zip(range(args.limit), sources))
+    prof.run(sources)
+    prof.write(args.out)
+    prof.report(args.top, args.functions)
+    print(f"\nwrote {args.out}/", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Compact, memory-mappable embedding storage: float32, float16 or int8 with a
+per-vector scale.
+
+    store = QuantizedStore(path, dtype="int8")
+    store.add(vectors)                      # rows from TextEmbedder.encode
+    scores = store.scores(query_vec)        # one score per stored row
+    store.similarity_error(float32_rows, queries)
+
+Scoring walks the memory-mapped rows in blocks and widens one block at a time,
+so no float32 copy of the whole matrix is ever built.
+"""
+import json
+import os
+
+import numpy as np
+
+DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+def quantize(vectors, dtype):
+    """(rows, scales); scales is None except for int8 (symmetric, per row)."""
+    v = np.asarray(vectors, dtype=np.float32)
+    if dtype == "int8":
+        scales = np.abs(v).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        q = np.clip(np.rint(v / scales[:, None]), -127, 127).astype(np.int8)
+        return q, scales.astype(np.float32)
+    return v.astype(DTYPES[dtype]), None
+
+class QuantizedStore:
+    def __init__(self, path, dim=None, dtype="float16"):
+        if dtype not in DTYPES:
+            raise ValueError(f"dtype must be one of {sorted(DTYPES)}")
+        self.path = path
+        self.dim = dim
+        self.dtype = dtype
+        self.count = 0
+        self._mm = None
+        self._scales = None
+        os.makedirs(path, exist_ok=True)
+        meta = self._file("meta.json")
+        if os.path.exists(meta):
+            with open(meta) as f:
+                m = json.load(f)
+            self.dim, self.dtype = m["dim"], m["dtype"]
+            self._recover()
+        elif dim is not None:
+            self._write_meta()
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _parts(self):
+        """(file, bytes per row) of every file holding one entry per row."""
+        parts = [("vectors.bin", self.dim * np.dtype(DTYPES[self.dtype]).itemsize)]
+        if self.dtype == "int8":
+            parts.append(("scales.f32", 4))
+        return parts
+
+    def _recover(self):
+        # add() appends vectors.bin then scales.f32; after a crash between the two
+        # (or mid-write) keep the rows present in both and cut the rest
+        sizes = []
+        for name, width in self._parts():
+            path = self._file(name)
+            sizes.append((path, os.path.getsize(path) if os.path.exists(path) else 0, width))
+        self.count = min(size // width for _, size, width in sizes)
+        for path, size, width in sizes:
+            if size != self.count * width:
+                with open(path, "r+b") as f:
+                    f.truncate(self.count * width)
+
+    def _write_meta(self):
+        with open(self._file("meta.json"), "w") as f:
+            json.dump({"dim": self.dim, "dtype": self.dtype}, f)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, vectors):
+        """Append rows; returns the first new row number."""
+        v = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if self.dim is None:
+            self.dim = v.shape[1]
+            self._write_meta()
+        if v.shape[1] != self.dim:
+            raise ValueError(f"expected dim {self.dim}, got {v.shape[1]}")
+        q, scales = quantize(v, self.dtype)
+        with open(self._file("vectors.bin"), "ab") as f:
+            f.write(q.tobytes())
+        if scales is not None:
+            with open(self._file("scales.f32"), "ab") as f:
+                f.write(scales.tobytes())
+        first = self.count
+        self.count += len(v)
+        self._mm = self._scales = None
+        return first
+
+    @classmethod
+    def build_from(cls, path, matrix, dtype="float16", block=65536):
+        """Quantize an existing float32 matrix (e.g. a ResumeIndex memmap) block by block."""
+        store = cls(path, matrix.shape[1], dtype)
+        for s in range(0, matrix.shape[0], block):
+            store.add(np.asarray(matrix[s:s + block]))
+        return store
+
+    def _matrix(self):
+        if self._mm is None and self.count:
+            self._mm = np.memmap(self._file("vectors.bin"), dtype=DTYPES[self.dtype], mode="r",
+                                 shape=(self.count, self.dim))
+            if self.dtype == "int8":
+                self._scales = np.memmap(self._file("scales.f32"), dtype=np.float32, mode="r", shape=(self.count,))
+        return self._mm
+
+    def scores(self, query, block=65536):
+        """Dot product of query with every stored row (cosine for normalised inputs)."""
+        q = np.asarray(query, dtype=np.float32).ravel()
+        mm = self._matrix()
+        out = np.empty(self.count, dtype=np.float32)
+        for s in range(0, self.count, block):
+            e = min(s + block, self.count)
+            part = mm[s:e].astype(np.float32) @ q
+            if self.dtype == "int8":
+                part *= self._scales[s:e]
+            out[s:e] = part
+        return out
+
+    def top_k(self, query, k=10, block=65536):
+        """[(row, score)] best first."""
+        s = self.scores(query, block)
+        if len(s) > k:
+            idx = np.argpartition(-s, k - 1)[:k]
+        else:
+            idx = np.arange(len(s))
+        idx = idx[np.argsort(-s[idx], kind="stable")]
+        return list(zip(idx.tolist(), s[idx].tolist()))
+
+    def dequantize(self, rows):
+        """float32 copies of the given rows only."""
+        v = np.asarray(self._matrix()[rows], dtype=np.float32)
+        if self.dtype == "int8":
+            v *= np.asarray(self._scales[rows])[..., None]
+        return v
+
+    def nbytes(self):
+        per_row = self.dim * np.dtype(DTYPES[self.dtype]).itemsize + (4 if self.dtype == "int8" else 0)
+        return self.count * per_row
+
+    def similarity_error(self, reference, queries, k=10):
+        """
+        Score error vs float32: `reference` holds the same rows in float32. Returns
+        max/mean absolute score error, recall@k of the top-k and bytes per vector.
+        """
+        reference = np.asarray(reference, dtype=np.float32)
+        max_err = sum_err = 0.0
+        n = hits = 0
+        for q in np.atleast_2d(np.asarray(queries, dtype=np.float32)):
+            exact = reference @ q
+            approx = self.scores(q)
+            err = np.abs(exact - approx)
+            max_err = max(max_err, float(err.max()))
+            sum_err += float(err.sum())
+            n += len(err)
+            kk = min(k, len(exact))
+            want = set(np.argpartition(-exact, kk - 1)[:kk].tolist())
+            got = set(np.argpartition(-approx, kk - 1)[:kk].tolist())
+            hits += len(want & got)
+        nq = len(np.atleast_2d(queries))
+        return {
+            "dtype": self.dtype,
+            "max_abs_error": max_err,
+            "mean_abs_error": sum_err / n if n else 0.0,
+            f"recall@{k}": hits / (nq * min(k, len(reference))) if nq and len(reference) else 1.0,
+            "bytes_per_vector": self.nbytes() / self.count if self.count else 0,
+        }
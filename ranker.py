@@ -0,0 +1,46 @@
+import numpy as np
+from src.jd_parser import parse_jd
+from src.matcher import compute_skill_coverage, compute_overall_score
+from src.resume_parser import extract_skills_from_text
+
+def _as_resume(r):
+    if isinstance(r, dict):
+        return r
+    text = r or ""
+    return {"raw_text": text, "skills": extract_skills_from_text(text)}
+
+def rank_resumes(jd_text, resumes, top_k=10, embedder=None, chunked=None):
+    """
+    Score one JD against many resumes in a single batched pass.
+    `resumes` is a list of parse_resume() dicts or plain resume texts.
+    chunked: None for whole-text similarity, or "max"/"mean" to aggregate over
+    section chunks (TextEmbedder.chunked_similarities).
+    Returns the top_k results, best first; "index" points back into `resumes`.
+    """
+    if embedder is None:
+        from src.embedder import TextEmbedder
+        embedder = TextEmbedder()
+    resumes = [_as_resume(r) for r in resumes]
+    if not resumes:
+        return []
+    jd = parse_jd(jd_text)
+    texts = [r["raw_text"] for r in resumes]
+    if chunked:
+        sims = embedder.chunked_similarities(jd["raw_text"], texts, agg=chunked)
+    else:
+        sims = embedder.similarities(jd["raw_text"], texts)
+
+    results = []
+    for i, r in enumerate(resumes):
+        sem = float(sims[i])
+        cov, matched, missing = compute_skill_coverage(r["skills"], jd["required_skills"])
+        results.append({
+            "index": i,
+            "semantic_similarity": sem,
+            "skill_coverage": cov,
+            "matched_skills": matched,
+            "missing_skills": missing,
+            "overall_score": compute_overall_score(sem, cov),
+        })
+    order = np.argsort([-x["overall_score"] for x in results], kind="stable")
+    return [results[i] for i in order[:top_k]]
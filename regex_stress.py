@@ -0,0 +1,174 @@
+"""
+Regex stress and clean_text differential fuzzing.
+
+    python -m src.regex_stress --budget 2.0 --max-size 262144
+    python -m src.regex_stress --fuzz 20000 --seed 1
+
+Every module-level compiled pattern in MODULES, plus the text helpers that
+use them, is run over pathological inputs (huge whitespace runs, long digit
+and word runs, nested or unclosed parentheses, ...) at doubling sizes. A
+case fails when its time per MB of input exceeds --budget seconds; sizes
+stop growing at the first failure, so a quadratic pattern is reported
+instead of hanging the run. --fuzz compares clean_text with the original
+sequential implementation on random inputs; any difference is a failure.
+Exit status is 1 on any failure.
+"""
+import argparse
+import importlib
+import random
+import re
+import sys
+import time
+
+from src import resume_parser
+
+MODULES = ["src.resume_parser", "src.ats", "src.document", "src.jd_parser"]
+
+# patterns only ever used with .match() at a fixed offset; an unanchored scan
+# is not how they run, so they are timed with .match()
+ANCHORED = {"src.resume_parser._email_at_re"}
+
+# text helpers exercised alongside the raw patterns
+FUNCTIONS = {
+    "clean_text": resume_parser.clean_text,
+    "_remove_tech_parentheses": resume_parser._remove_tech_parentheses,
+    "_clean_name_candidate": resume_parser._clean_name_candidate,
+    "_sub_emails": resume_parser._sub_emails,
+    "_generate_summary_from_resume": lambda s: resume_parser._generate_summary_from_resume(s, []),
+}
+
+# name -> unit repeated up to the requested size
+PATHOLOGICAL = {
+    "spaces": " ",
+    "mixed_ws": " \t\x0b\x0c",
+    "newlines": "\n",
+    "digits": "9",
+    "spaced_digits": "9 ",
+    "dashed_digits": "12-",
+    "word": "a",
+    "dotted_word": "a.",
+    "at_runs": "a@",
+    "hyphens": "-",
+    "open_parens": "(",
+    "nested_parens": "((flask ",
+    "unclosed_tech": "(flask, ",
+    "acronym_list": "(A, ",
+    "passive": "is ",
+    "urls": "www.",
+    "social": "linkedin",
+    "cid": "(cid:",
+    "non_ascii": "é",
+    "private_use": "\uf0b7",
+    "sentences": "a. ",
+}
+
+def module_patterns(modules=MODULES):
+    """(qualified name, pattern) for every compiled regex at module level."""
+    out = []
+    for mod_name in modules:
+        mod = importlib.import_module(mod_name)
+        for name, val in sorted(vars(mod).items()):
+            if isinstance(val, re.Pattern):
+                out.append((f"{mod_name}.{name}", val))
+    return out
+
+def make_input(unit, size):
+    return (unit * (size // len(unit) + 1))[:size]
+
+def _cases(modules):
+    for name, pat in module_patterns(modules):
+        yield name, pat.match if name in ANCHORED else pat.findall
+    yield from FUNCTIONS.items()
+
+def stress(budget=2.0, min_size=4096, max_size=262144, modules=MODULES):
+    """Time every case on every pathological input; returns (rows, failures)."""
+    rows, failures = [], []
+    for case, fn in _cases(modules):
+        for kind, unit in PATHOLOGICAL.items():
+            size = min_size
+            while size <= max_size:
+                text = make_input(unit, size)
+                t0 = time.perf_counter()
+                fn(text)
+                dt = time.perf_counter() - t0
+                per_mb = dt * (1 << 20) / size
+                row = {"case": case, "input": kind, "size": size, "seconds": dt, "seconds_per_mb": per_mb}
+                rows.append(row)
+                if per_mb > budget:
+                    failures.append(row)
+                    break
+                size *= 4
+    return rows, failures
+
+# ---- clean_text reference ----
+def _clean_text_reference(text):
+    """clean_text as it was before the passes were fused; the fuzz oracle."""
+    if not text:
+        return ""
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = resume_parser._cid_re.sub(" ", text)
+    text = resume_parser._url_re.sub(" ", text)
+    text = resume_parser._social_token_re.sub(" ", text)
+    text = resume_parser._weird_chars_re.sub(" ", text)
+    text = re.sub(r'[^\x00-\x7F]+', " ", text)
+    lines = []
+    for raw_line in text.split("\n"):
+        line = raw_line.replace('\t', ' ').replace('•', ' ').replace('–', '-')
+        line = re.sub(r'\s+', ' ', line).strip()
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
+
+_FRAGMENTS = [
+    "a", "Z", "_", "1", ".", "-", "/", ":", "(", ")", " ", "  ", "\t", "\n", "\r", "\r\n", "\x0b", "\x1c",
+    "\xa0", "\u2003", "\x85", "é", "•", "–", "İ", "ı", "\u212a", "\uf0b7", "\uff21", "\U0001f600",
+    "http://", "https://", "www.", "x.com", "(cid:", "(cid:12)", "cid", "12)",
+    "linkedin", "LinkedIn", "GITHUB", "portfolio", "behance", "dribbble", "hackerrank", "linked",
+]
+
+def fuzz_clean_text(n=20000, seed=0, max_len=24):
+    """Compare clean_text with the reference on n random inputs; returns the mismatching inputs."""
+    rnd = random.Random(seed)
+    bad = []
+    for _ in range(n):
+        s = "".join(rnd.choice(_FRAGMENTS) for _ in range(rnd.randint(0, max_len)))
+        if resume_parser.clean_text(s) != _clean_text_reference(s):
+            bad.append(s)
+    return bad
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Stress module-level regexes and fuzz clean_text.")
+    ap.add_argument("--budget", type=float, default=2.0, help="allowed seconds per MB of input")
+    ap.add_argument("--min-size", type=int, default=4096)
+    ap.add_argument("--max-size", type=int, default=262144)
+    ap.add_argument("--fuzz", type=int, default=20000, help="clean_text fuzz iterations (0 to skip)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("-v", "--verbose", action="store_true", help="print every timing")
+    args = ap.parse_args(argv)
+
+    ok = True
+    rows, failures = stress(args.budget, args.min_size, args.max_size)
+    worst = {}
+    for r in rows:
+        key = r["case"]
+        if key not in worst or r["seconds_per_mb"] > worst[key]["seconds_per_mb"]:
+            worst[key] = r
+        if args.verbose:
+            print(f"{r['case']:<45} {r['input']:<14} {r['size']:>8} {r['seconds_per_mb']:8.3f} s/MB")
+    for key, r in worst.items():
+        print(f"{key:<45} worst {r['seconds_per_mb']:8.3f} s/MB on {r['input']} ({r['size']} chars)")
+    for r in failures:
+        ok = False
+        print(f"FAIL {r['case']} on {r['input']} x {r['size']}: {r['seconds_per_mb']:.2f} s/MB "
+              f"(budget {args.budget})", file=sys.stderr)
+
+    if args.fuzz:
+        bad = fuzz_clean_text(args.fuzz, args.seed)
+        print(f"clean_text fuzz: {args.fuzz - len(bad)}/{args.fuzz} identical to reference")
+        ok = ok and not bad
+        for s in bad[:10]:
+            print(f"FAIL clean_text differs on {s!r}", file=sys.stderr)
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
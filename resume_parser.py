@@ -1,26 +1,33 @@
 # src/resume_parser.py (FINAL — aggressive cleaning + robust summary/education)
-import pdfplumber
+import io
 import re
+import signal
+import threading
+from functools import lru_cache
 
-# Try to import skills db; fallback to empty list
-try:
-    from src.skills_db import ALL_SKILLS
-except Exception:
-    ALL_SKILLS = []
+from src import metrics
+from src.document import _SECTION_HEADERS, _SENT_SPLIT_RE, _is_section_header, as_document
+from src.skill_matcher import default_matcher, get_matcher
+
+# Bump whenever extraction, cleaning, skill or overview output changes;
+# persisted parse results (src.resume_store) from other versions are ignored.
+PARSER_VERSION = "2"
 
 # ---- regex helpers ----
-_email_re = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+# the lookbehind pins matches to the start of a [\w.-] run: unanchored, a long
+# run without '@' was rescanned from every offset (quadratic). search() results
+# are unchanged; _sub_emails() reproduces the old sub() exactly.
+_email_re = re.compile(r'(?<![\w.-])[\w.-]+@[\w.-]+\.\w+')
+_email_at_re = re.compile(r'[\w.-]+@[\w.-]+\.\w+')
 _phone_re = re.compile(r'(\+?\d{1,3}[-\s]?)?(\d{10}|\d{5}[-\s]\d{5}|\d{3}[-\s]\d{3}[-\s]\d{4})')
 _cid_re = re.compile(r'\(cid:\d+\)')
 _weird_chars_re = re.compile(r'[\uf000-\uffff]')
 _url_re = re.compile(r'https?://\S+|www\.\S+')
+_education_re = re.compile(r'\beducation\b')
 _social_token_re = re.compile(r'\b(linkedin|hackerrank|github|portfolio|behance|dribbble)\b', re.IGNORECASE)
-
-_SECTION_HEADERS = [
-    "summary", "profile", "professional summary", "objective",
-    "education", "experience", "projects", "skills",
-    "certifications", "work experience", "achievements", "projects", "education:"
-]
+_ws_re = re.compile(r'\s+')
+_name_sep_re = re.compile(r'\||,|-|•')
+_non_alpha_re = re.compile(r'[^A-Za-z\s]')
 
 _LOCATION_TOKENS = {
     "india","gujarat","ahmedabad","mumbai","delhi","bangalore","bengaluru","pune","chennai","hyderabad",
@@ -34,57 +41,198 @@ _TECH_KEYWORDS = [
     "opencv","streamlit","scikit","keras","dl","api","r","sql","react","node","mongodb","fastapi"
 ]
 
-# build regexes for parentheses removal
-_TECH_PAREN_RE = re.compile(r'\([^)]*(?:' + r'|'.join(re.escape(tok) for tok in _TECH_KEYWORDS) + r')[^)]*\)', re.I)
+# parentheses removal; a "(...)" is dropped when it contains a tech token
+_TECH_TOKEN_RE = re.compile(r'|'.join(re.escape(tok) for tok in _TECH_KEYWORDS), re.I)
 _PAREN_ACRONYM_RE = re.compile(r'\(\s*[A-Z]{1,6}(?:\s*,\s*[A-Z]{1,6})*\s*\)')  # (GAN), (GAN, FLASK)
 
 # ---- pdf extraction ----
-def extract_text_from_pdf(file):
-    text = ""
+# per-document budgets; a resume past these is either malformed or hostile
+PDF_MAX_PAGES = 50
+PDF_MAX_CHARS = 500_000
+PDF_TIMEOUT = 60           # seconds
+PDF_MAX_MEMORY_MB = 1024   # address-space cap for sandboxed extraction
+
+class PdfExtraction:
+    """Pages extracted so far and, if extraction stopped early, why."""
+
+    def __init__(self):
+        self.pages = []
+        self.chars = 0
+        # None, "max_pages", "max_chars", "timeout", "memory", "crashed" or "error: <msg>"
+        self.truncated = None
+
+    @property
+    def text(self):
+        return "".join(t + "\n" for t in self.pages)
+
+class _ExtractionTimeout(Exception):
+    pass
+
+def iter_pdf_pages(file, max_pages=None):
+    """
+    Yield page text one page at a time, releasing each page's layout objects after use.
+    After max_pages pages a final None marks that more pages were left unextracted.
+    """
+    import pdfplumber  # heavy (pdfminer); only needed once a PDF is actually opened
+    with pdfplumber.open(file) as pdf:
+        for i, page in enumerate(pdf.pages):
+            if max_pages is not None and i >= max_pages:
+                yield None
+                return
+            try:
+                yield page.extract_text() or ""
+            finally:
+                close = getattr(page, "close", None)
+                if close:
+                    close()
+
+def _collect_pages(res, pages, max_chars, on_page=None):
+    for t in pages:
+        if t is None:
+            res.truncated = "max_pages"
+            break
+        if max_chars is not None and res.chars + len(t) > max_chars:
+            t = t[:max_chars - res.chars]
+            res.truncated = "max_chars"
+        res.pages.append(t)
+        res.chars += len(t)
+        if on_page:
+            on_page(t)
+        if res.truncated:
+            break
+
+def _alarm_usable():
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+def extract_pdf(file, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, timeout=None):
+    """
+    Incremental, budgeted extraction. Stops after max_pages pages or max_chars
+    characters; with `timeout` (seconds, main thread on POSIX only) it also stops
+    on wall-clock. Never raises: failures are recorded in .truncated.
+    """
+    res = PdfExtraction()
+    use_alarm = bool(timeout) and _alarm_usable()
+    if use_alarm:
+        def _on_alarm(signum, frame):
+            raise _ExtractionTimeout()
+        prev = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
     try:
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                t = page.extract_text() or ""
-                text += t + "\n"
-    except Exception:
+        _collect_pages(res, iter_pdf_pages(file, max_pages), max_chars)
+    except _ExtractionTimeout:
+        res.truncated = "timeout"
+    except MemoryError:
+        res.truncated = "memory"
+    except Exception as e:
+        res.truncated = f"error: {type(e).__name__}: {e}"
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, prev)
+    return res
+
+def _sandbox_child(conn, data, max_pages, max_chars, max_memory_mb):
+    try:
+        if max_memory_mb:
+            import resource
+            limit = int(max_memory_mb) * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        res = PdfExtraction()
         try:
-            file.seek(0)
-            with pdfplumber.open(file) as pdf:
-                for page in pdf.pages:
-                    t = page.extract_text() or ""
-                    text += t + "\n"
-        except Exception:
-            return ""
-    return text
+            # stream each page so the parent keeps partial text if we are killed
+            _collect_pages(res, iter_pdf_pages(io.BytesIO(data), max_pages), max_chars,
+                           on_page=lambda t: conn.send(("page", t)))
+        except MemoryError:
+            res.truncated = "memory"
+        except Exception as e:
+            res.truncated = f"error: {type(e).__name__}: {e}"
+        conn.send(("done", res.truncated))
+    finally:
+        conn.close()
+
+def extract_pdf_sandboxed(file, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, timeout=PDF_TIMEOUT,
+                          max_memory_mb=PDF_MAX_MEMORY_MB):
+    """
+    Run extraction in a child process with a wall-clock timeout and an address-space
+    cap, so one hostile PDF cannot stall or exhaust the caller. Works from any
+    thread (unlike extract_pdf's timeout). Pages stream back as they are produced;
+    on timeout or crash the partial text is kept.
+    `file` is a path, bytes or a binary file-like object.
+    """
+    import multiprocessing as mp
+    import time
+    if isinstance(file, (bytes, bytearray)):
+        data = bytes(file)
+    elif isinstance(file, str):
+        with open(file, "rb") as f:
+            data = f.read()
+    else:
+        data = file.read()
+    res = PdfExtraction()
+    # spawn: forking a threaded parent (Streamlit, the HTTP service) can deadlock the child
+    ctx = mp.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_sandbox_child, args=(child, data, max_pages, max_chars, max_memory_mb), daemon=True)
+    proc.start()
+    child.close()
+    deadline = time.monotonic() + timeout if timeout else None
+    try:
+        while True:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not parent.poll(wait):
+                res.truncated = "timeout"
+                break
+            try:
+                kind, val = parent.recv()
+            except EOFError:
+                res.truncated = "crashed"
+                break
+            if kind == "page":
+                res.pages.append(val)
+                res.chars += len(val)
+            else:
+                res.truncated = val
+                break
+    finally:
+        if proc.is_alive():
+            proc.kill()
+        proc.join()
+        parent.close()
+    return res
+
+def extract_text_from_pdf(file):
+    return extract_pdf(file).text
 
 # ---- cleaning preserving newlines ----
+# clean_text used to run cid -> url -> social -> weird-char -> non-ascii
+# substitutions one after another; this alternation does all of them in a
+# single scan. Each branch is constrained so it only matches what the
+# sequential passes would have: urls stop before a (cid:N) that was already
+# blanked, social tokens also end where a url starts, and the non-ascii run
+# leaves private-use chars to the per-char branch. src.regex_stress checks
+# the output against the sequential version.
+_CID = r'\(cid:\d+\)'
+_URL_BODY = r'(?:(?!' + _CID + r')\S)+'
+_CLEAN_RE = re.compile(
+    _CID
+    + r'|https?://' + _URL_BODY + r'|www\.' + _URL_BODY
+    + r'|(?i:\b(?:linkedin|hackerrank|github|portfolio|behance|dribbble)(?:\b|(?=(?:https?://|www\.)(?!' + _CID + r')\S)))'
+    + r'|[\uf000-\uffff]'
+    + r'|[^\x00-\x7F\uf000-\uffff]+'
+)
+
 def clean_text(text):
     if not text:
         return ""
-    text = text.replace('\r\n', '\n').replace('\r', '\n')
-    text = _cid_re.sub(" ", text)
-    text = _url_re.sub(" ", text)
-    text = _social_token_re.sub(" ", text)
-    text = _weird_chars_re.sub(" ", text)
-    text = re.sub(r'[^\x00-\x7F]+', " ", text)
-    lines = []
-    for raw_line in text.split("\n"):
-        line = raw_line.replace('\t', ' ').replace('•', ' ').replace('–', '-')
-        line = re.sub(r'\s+', ' ', line).strip()
-        if line:
-            lines.append(line)
-    return "\n".join(lines)
+    text = _CLEAN_RE.sub(" ", text.replace('\r\n', '\n').replace('\r', '\n'))
+    # only ascii is left, so '\t', '•' and '–' need no special casing
+    return "\n".join(line for line in (" ".join(raw.split()) for raw in text.split("\n")) if line)
 
 # ---- skills extraction ----
 def extract_skills_from_text(text, skills_list=None):
-    if skills_list is None:
-        skills_list = ALL_SKILLS or []
-    t = (text or "").lower()
-    found = set()
-    for sk in skills_list:
-        if sk.lower() in t:
-            found.add(sk.lower())
-    return sorted(found)
+    m = default_matcher() if skills_list is None else get_matcher(skills_list)
+    doc = as_document(text)
+    return m.find(doc.lower, lowered=True)
 
 # ---- small helpers ----
 def _is_name_line(line):
@@ -106,40 +254,61 @@ def _clean_name_candidate(raw):
     if not raw:
         return None
     s = raw
-    s = _email_re.sub(" ", s)
+    s = _sub_emails(s)
     s = _phone_re.sub(" ", s)
     s = _url_re.sub(" ", s)
     s = _social_token_re.sub(" ", s)
-    s = re.split(r'\||,|-|•', s)[0].strip()
-    tokens = [t.strip() for t in re.split(r'\s+', s) if t.strip()]
+    s = _name_sep_re.split(s, 1)[0]
+    tokens = s.split()
     while tokens and tokens[-1].lower() in _LOCATION_TOKENS:
         tokens.pop()
     name = " ".join(tokens[:4])
-    name = re.sub(r'[^A-Za-z\s]', '', name).strip()
+    name = _non_alpha_re.sub('', name).strip()
     return name or None
 
-def _is_section_header(line):
-    if not line:
-        return False
-    low = line.lower().strip().rstrip(':')
-    if low in _SECTION_HEADERS:
-        return True
-    for h in _SECTION_HEADERS:
-        if low.startswith(h + " ") or low.startswith(h + ":"):
-            return True
-    if line.strip().isupper() and len(line.strip()) < 40:
-        return True
-    return False
+def _sub_emails(s, repl=" "):
+    """_email_re.sub() as the unanchored pattern did it, in linear time."""
+    out = []
+    pos = 0
+    while True:
+        # right after a match the old pattern could restart mid-run ("a@b.c-d@e.f")
+        m = (pos and _email_at_re.match(s, pos)) or _email_re.search(s, pos)
+        if not m:
+            break
+        out.append(s[pos:m.start()])
+        out.append(repl)
+        pos = m.end()
+    out.append(s[pos:])
+    return "".join(out)
+
+def _strip_tech_parens(s):
+    # one pass over ")"-delimited segments: a segment's first "(" opens the
+    # leftmost candidate, and it matches iff a tech token lies before the ")"
+    out = []
+    pos = 0
+    while True:
+        close = s.find(")", pos)
+        if close < 0:
+            break
+        open_ = s.find("(", pos, close)
+        if open_ >= 0 and _TECH_TOKEN_RE.search(s, open_ + 1, close):
+            out.append(s[pos:open_])
+            out.append(" ")
+        else:
+            out.append(s[pos:close + 1])
+        pos = close + 1
+    out.append(s[pos:])
+    return "".join(out)
 
 def _remove_tech_parentheses(s):
     """Remove parentheses that are likely tech stacks or short acronyms."""
     if not s:
         return s
-    s = _TECH_PAREN_RE.sub(" ", s)
+    s = _strip_tech_parens(s)
     s = _PAREN_ACRONYM_RE.sub(" ", s)
-    s = re.sub(r'\s+', ' ', s).strip()
-    return s
+    return " ".join(s.split())
 
+@lru_cache(maxsize=8192)
 def _looks_like_project_title(l):
     """Heuristic: short line (<12 words) containing many tech keywords => project title."""
     low = l.lower()
@@ -157,7 +326,7 @@ def _generate_summary_from_resume(text, detected_skills, max_sentences=3):
         return "_No clear summary found._"
     # first aggressively strip tech parentheses for sentence-level processing
     cleaned_text = _remove_tech_parentheses(text)
-    sents = re.split(r'(?<=[.!?])\s+', cleaned_text)
+    sents = _SENT_SPLIT_RE.split(cleaned_text)
     sents = [s.strip() for s in sents if len(s.strip()) > 15]
     personal_tokens = ["student","passionate","dedicated","enthusiast","seeking","intern","professional","graduate","undergraduate","research","aspiring"]
     action_verbs = ["developed","implemented","designed","built","trained","optimized","deployed","created","engineered","improved","led","analyzed","automated"]
@@ -167,9 +336,9 @@ def _generate_summary_from_resume(text, detected_skills, max_sentences=3):
         if _looks_like_project_title(s):
             continue
         if any(tok in low for tok in personal_tokens) and len(chosen) < max_sentences:
-            chosen.append(re.sub(r'\s+', ' ', s))
+            chosen.append(_ws_re.sub(' ', s))
         elif any(v in low for v in action_verbs) and len(chosen) < max_sentences:
-            chosen.append(re.sub(r'\s+', ' ', s))
+            chosen.append(_ws_re.sub(' ', s))
         if len(chosen) >= max_sentences:
             break
     if chosen:
@@ -181,7 +350,7 @@ def _generate_summary_from_resume(text, detected_skills, max_sentences=3):
         s = f"Skilled in {top}. Experienced in building machine learning models and data-driven solutions."
     else:
         s = "Passionate Machine Learning practitioner with experience in applied ML and data-driven solutions."
-    return " ".join(re.split(r'(?<=[.!?])\s+', s)[:max_sentences])
+    return " ".join(_SENT_SPLIT_RE.split(s)[:max_sentences])
 
 # ---- stricter education extraction ----
 def _extract_education_from_lines(lines):
@@ -218,17 +387,40 @@ def _extract_education_from_lines(lines):
     return list(dict.fromkeys(edu))[:5]
 
 # ---- main parse + overview ----
-def parse_resume(file, skills_list=None):
-    raw = extract_text_from_pdf(file)
-    cleaned = clean_text(raw)
+@metrics.timed("parse_resume")
+def parse_resume(file, skills_list=None, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, timeout=PDF_TIMEOUT,
+                 sandbox=False, max_memory_mb=PDF_MAX_MEMORY_MB):
+    """
+    Extract, clean and detect skills. With sandbox=True (untrusted uploads) the PDF
+    is extracted by extract_pdf_sandboxed under timeout and max_memory_mb; otherwise
+    in-process, where timeout only applies on the main thread.
+    """
+    if sandbox:
+        ext = extract_pdf_sandboxed(file, max_pages, max_chars, timeout, max_memory_mb)
+    else:
+        ext = extract_pdf(file, max_pages=max_pages, max_chars=max_chars, timeout=timeout)
+    cleaned = clean_text(ext.text)
     skills = extract_skills_from_text(cleaned, skills_list)
-    return {"raw_text": cleaned, "skills": skills}
+    metrics.inc("resume_pdf_pages_total", len(ext.pages))
+    metrics.inc("resume_chars_total", len(cleaned), stage="parse_resume")
+    if ext.truncated:
+        metrics.inc("resume_pdf_truncated_total", reason=ext.truncated.split(":")[0])
+    return {"raw_text": cleaned, "skills": skills, "pages": len(ext.pages), "truncated": ext.truncated}
 
-def generate_overview(resume_text, detected_skills, max_skill_show=10):
-    text = (resume_text or "").strip()
+# timed here rather than on generate_overview: the store and the app call this
+# directly, and render_overview is only string formatting
+@metrics.timed("generate_overview")
+def extract_overview_fields(resume_text, detected_skills, max_skill_show=10):
+    """
+    Name, contact, summary, top skills and education; None when there is no text.
+    resume_text may be a str or an AnalyzedDocument.
+    """
+    doc = as_document(resume_text)
+    text = doc.text.strip()
     if not text:
-        return "_No resume text available._"
-    lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
+        return None
+    lines = doc.lines
+    lower_lines = doc.lower_lines
 
     # NAME
     name = None
@@ -259,16 +451,14 @@ def generate_overview(resume_text, detected_skills, max_skill_show=10):
                 break
     # block header
     if not summary:
-        for idx, l in enumerate(lines):
-            low = l.lower().strip()
+        for idx, low in enumerate(lower_lines):
             if low in ("profile summary","profile","summary","professional summary","objective") or low.startswith(("profile summary:","profile:","summary:","professional summary:","objective:")):
                 collected = []
-                for nl in lines[idx+1: idx+8]:
-                    if not nl:
-                        continue
+                for j in range(idx+1, min(idx+8, len(lines))):
+                    nl = lines[j]
                     if _email_re.search(nl) or _phone_re.search(nl) or _url_re.search(nl):
                         continue
-                    if _is_section_header(nl) and len(collected) > 0:
+                    if j in doc.header_lines and len(collected) > 0:
                         break
                     cleaned_nl = _remove_tech_parentheses(nl)
                     if _looks_like_project_title(cleaned_nl) and len(cleaned_nl.split()) <= 12:
@@ -307,16 +497,16 @@ def generate_overview(resume_text, detected_skills, max_skill_show=10):
     # EDUCATION: prefer block under Education header, else scan lines
     edu = []
     edu_idx = None
-    for i, l in enumerate(lines):
-        if re.search(r'\beducation\b', l, flags=re.I):
+    for i, low in enumerate(lower_lines):
+        if "education" in low and _education_re.search(low):
             edu_idx = i
             break
     if edu_idx is not None:
         block = []
-        for nl in lines[edu_idx+1: edu_idx+16]:
-            if _is_section_header(nl) and len(block) > 0:
+        for j in range(edu_idx+1, min(edu_idx+16, len(lines))):
+            if j in doc.header_lines and len(block) > 0:
                 break
-            block.append(nl)
+            block.append(lines[j])
         edu = _extract_education_from_lines(block)
     else:
         edu = _extract_education_from_lines(lines)
@@ -326,6 +516,15 @@ def generate_overview(resume_text, detected_skills, max_skill_show=10):
     # skills
     top_skills = detected_skills[:max_skill_show] if detected_skills else ["No skills detected"]
 
+    return {"name": name, "email": email, "phone": phone, "summary": summary,
+            "top_skills": top_skills, "education": edu}
+
+def render_overview(fields):
+    if not fields:
+        return "_No resume text available._"
+    name, email, phone = fields["name"], fields["email"], fields["phone"]
+    summary, top_skills, edu = fields["summary"], fields["top_skills"], fields["education"]
+
     # build md
     md = []
     md.append("### 📄 Resume Overview")
@@ -357,27 +556,40 @@ def generate_overview(resume_text, detected_skills, max_skill_show=10):
     md.append("_Generated clean overview._")
     return "\n\n".join(md)
 
+def generate_overview(resume_text, detected_skills, max_skill_show=10):
+    """Markdown overview; resume_text may be a str or an AnalyzedDocument."""
+    return render_overview(extract_overview_fields(resume_text, detected_skills, max_skill_show))
+
 # ---- debug helper ----
-def debug_parse_file(path_or_file):
+def debug_parse_file(path_or_file, stage=None, quiet=False):
     """
     Print raw -> cleaned -> line-by-line view, found summary and education (useful to paste here).
+    stage(name, fn, *args) runs each pipeline step ("extract", "clean", "skills",
+    "overview"); src.profile_parse passes one that profiles them. quiet skips the
+    printing. Returns page/char counts, truncation reason, skills and overview.
     """
+    run = stage or (lambda name, fn, *args: fn(*args))
     if isinstance(path_or_file, str):
         with open(path_or_file, "rb") as f:
-            raw = extract_text_from_pdf(f)
+            ext = run("extract", extract_pdf, f)
     else:
-        raw = extract_text_from_pdf(path_or_file)
-    cleaned = clean_text(raw)
-    skills = extract_skills_from_text(cleaned)
-    print("----- RAW (first 900 chars) -----")
-    print(raw[:900])
-    print("\n----- CLEANED (first 900 chars) -----")
-    print(cleaned[:900])
-    print("\n----- LINES (first 40 lines) -----")
-    lines = [ln for ln in cleaned.split("\n")]
-    for i, ln in enumerate(lines[:40]):
-        print(f"{i:02d}: {ln}")
-    print("\n----- SKILLS DETECTED -----")
-    print(skills[:80])
-    print("\n----- GENERATED OVERVIEW -----")
-    print(generate_overview(cleaned, skills))
+        ext = run("extract", extract_pdf, path_or_file)
+    raw = ext.text
+    cleaned = run("clean", clean_text, raw)
+    skills = run("skills", extract_skills_from_text, cleaned)
+    overview = run("overview", generate_overview, cleaned, skills)
+    if not quiet:
+        print("----- RAW (first 900 chars) -----")
+        print(raw[:900])
+        print("\n----- CLEANED (first 900 chars) -----")
+        print(cleaned[:900])
+        print("\n----- LINES (first 40 lines) -----")
+        lines = [ln for ln in cleaned.split("\n")]
+        for i, ln in enumerate(lines[:40]):
+            print(f"{i:02d}: {ln}")
+        print("\n----- SKILLS DETECTED -----")
+        print(skills[:80])
+        print("\n----- GENERATED OVERVIEW -----")
+        print(overview)
+    return {"pages": len(ext.pages), "chars": len(raw), "truncated": ext.truncated,
+            "skills": skills, "overview": overview}
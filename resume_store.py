@@ -0,0 +1,110 @@
+import hashlib
+import io
+import json
+import sqlite3
+import threading
+import time
+
+from src import metrics
+from src.resume_parser import PARSER_VERSION, extract_overview_fields, parse_resume
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed_resumes (
+    sha256 TEXT NOT NULL,
+    parser_version TEXT NOT NULL,
+    raw_text TEXT NOT NULL,
+    skills TEXT NOT NULL,
+    overview TEXT,
+    pages INTEGER,
+    truncated TEXT,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (sha256, parser_version)
+)
+"""
+
+def _effective_version():
+    # detected skills depend on the configured taxonomy too
+    from src.skills_db import get_taxonomy
+    tax = get_taxonomy()
+    return PARSER_VERSION if tax is None else f"{PARSER_VERSION}+tax{tax.version}"
+
+class ResumeStore:
+    """
+    Content-addressed cache of parse results in a local SQLite file, keyed by the
+    SHA-256 of the PDF bytes plus the parser version. Re-uploads of the same PDF
+    become a lookup; bumping PARSER_VERSION invalidates every entry. Misses are
+    parsed in a sandboxed child process unless sandbox=False.
+    """
+
+    def __init__(self, path="resume_store.sqlite3", parser_version=None, sandbox=True):
+        self.path = path
+        self.parser_version = parser_version or _effective_version()
+        self.sandbox = sandbox
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    @staticmethod
+    def digest(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, digest):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT raw_text, skills, overview, pages, truncated FROM parsed_resumes "
+                "WHERE sha256 = ? AND parser_version = ?", (digest, self.parser_version)
+            ).fetchone()
+        if row is None:
+            return None
+        raw_text, skills, overview, pages, truncated = row
+        return {"sha256": digest, "raw_text": raw_text, "skills": json.loads(skills),
+                "overview": json.loads(overview) if overview else None,
+                "pages": pages, "truncated": truncated}
+
+    def put(self, digest, record):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO parsed_resumes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (digest, self.parser_version, record["raw_text"], json.dumps(record["skills"]),
+                 json.dumps(record.get("overview")), record.get("pages"), record.get("truncated"), time.time())
+            )
+            self._db.commit()
+
+    def parse(self, file):
+        """parse_resume + overview fields for a path, bytes or file-like, served from the store when possible."""
+        if isinstance(file, (bytes, bytearray)):
+            data = bytes(file)
+        elif isinstance(file, str):
+            with open(file, "rb") as f:
+                data = f.read()
+        else:
+            data = file.read()
+        digest = self.digest(data)
+        rec = self.get(digest)
+        if rec is not None:
+            self.hits += 1
+            metrics.inc("resume_store_total", result="hit")
+            return rec
+        self.misses += 1
+        metrics.inc("resume_store_total", result="miss")
+        rec = parse_resume(io.BytesIO(data), sandbox=self.sandbox)
+        rec["overview"] = extract_overview_fields(rec["raw_text"], rec["skills"])
+        rec["sha256"] = digest
+        # don't pin results that were cut short by a timeout or crash
+        if rec["truncated"] in (None, "max_pages", "max_chars"):
+            self.put(digest, rec)
+        return rec
+
+    def purge_stale(self):
+        """Delete entries written by other parser versions; returns the number removed."""
+        with self._lock:
+            cur = self._db.execute("DELETE FROM parsed_resumes WHERE parser_version != ?", (self.parser_version,))
+            self._db.commit()
+        return cur.rowcount
+
+    def close(self):
+        self._db.close()
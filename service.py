@@ -0,0 +1,242 @@
+"""
+Headless HTTP scoring service for ATS integrations.
+
+    python -m src.service --port 8000 --parse-workers 4 --max-batch 64 --max-wait-ms 5 --max-body-mb 32
+
+    POST /parse   body: PDF bytes                      -> parsed resume + overview
+    POST /score   {"resume_text", "jd_text"}           -> semantic, coverage, overall and ATS scores
+    POST /rank    {"jd_text", "resumes": [...], "top_k"} -> rank_resumes() output
+    GET  /health, GET /metrics
+
+Texts from concurrent /score and /rank requests are gathered into micro-batches
+(bounded by --max-batch texts and --max-wait-ms) before a single encode call.
+PDF parsing runs on a process pool so it never blocks request threads.
+Bodies over --max-body-mb are refused with 413 before they are read.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from src import metrics
+from src.ats import compute_ats_score
+from src.embedder import TextEmbedder
+from src.ingest import _init_worker, process_one
+from src.jd_parser import parse_jd
+from src.matcher import compute_overall_score, compute_skill_coverage
+from src.ranker import rank_resumes
+from src.resume_parser import (PDF_MAX_CHARS, PDF_MAX_MEMORY_MB, PDF_MAX_PAGES, PDF_TIMEOUT,
+                               extract_skills_from_text)
+
+MAX_BODY_MB = 32
+
+_JSON_TYPES = {str: "a string", list: "an array", int: "an integer"}
+
+def _field(req, name, kind, default=None):
+    """req[name] checked against kind; raises ValueError (answered with 400) otherwise."""
+    if name not in req:
+        if default is not None:
+            return default
+        raise ValueError(f"missing field {name!r}")
+    value = req[name]
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise ValueError(f"field {name!r} must be {_JSON_TYPES[kind]}")
+    return value
+
+def _resume_item(r, i):
+    if isinstance(r, str):
+        return r
+    if (isinstance(r, dict) and isinstance(r.get("raw_text"), str) and isinstance(r.get("skills"), list)
+            and all(isinstance(s, str) for s in r["skills"])):
+        return r
+    raise ValueError(f"resumes[{i}] must be a string or an object with raw_text (string) and skills (array of strings)")
+
+class MicroBatcher:
+    """
+    Collects texts from concurrent callers and encodes them together. A batch is
+    flushed when it holds max_batch texts or max_wait_ms after its first request.
+    """
+
+    def __init__(self, encode, max_batch=64, max_wait_ms=5):
+        self.encode = encode
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._q = queue.Queue()
+        threading.Thread(target=self._loop, daemon=True, name="micro-batcher").start()
+
+    def submit(self, texts):
+        fut = Future()
+        self._q.put((list(texts), fut))
+        return fut
+
+    def _loop(self):
+        while True:
+            batch = [self._q.get()]
+            n = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while n < self.max_batch:
+                wait = deadline - time.monotonic()
+                if wait <= 0:
+                    break
+                try:
+                    item = self._q.get(timeout=wait)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                n += len(item[0])
+            texts = [t for item, _ in batch for t in item]
+            metrics.inc("resume_service_batches_total")
+            metrics.inc("resume_service_batched_texts_total", len(texts))
+            try:
+                vecs = self.encode(texts)
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            i = 0
+            for item, fut in batch:
+                fut.set_result(vecs[i:i + len(item)])
+                i += len(item)
+
+class BatchedEmbedder:
+    """TextEmbedder-compatible similarity API routed through a MicroBatcher."""
+
+    def __init__(self, batcher):
+        self.batcher = batcher
+
+    def similarity(self, text1, text2):
+        v = self.batcher.submit([text1, text2]).result()
+        return TextEmbedder.vector_similarity(v[0], v[1])
+
+    def similarities(self, query, texts):
+        texts = list(texts)
+        if not texts:
+            return np.zeros(0, dtype=np.float32)
+        v = self.batcher.submit([query] + texts).result()
+        return np.clip(TextEmbedder._row_scores(v[0:1], v[1:]), 0, 1)
+
+class ScoringService:
+    def __init__(self, parse_workers=None, max_batch=64, max_wait_ms=5, backend=None, pdf_timeout=PDF_TIMEOUT):
+        embedder = TextEmbedder(backend=backend).warm_up()
+        self.embedder = BatchedEmbedder(MicroBatcher(embedder.encode, max_batch, max_wait_ms))
+        limits = {"max_pages": PDF_MAX_PAGES, "max_chars": PDF_MAX_CHARS, "timeout": pdf_timeout}
+        # spawn: forking after the request and batcher threads exist can deadlock a worker
+        self.pool = ProcessPoolExecutor(parse_workers, mp_context=mp.get_context("spawn"),
+                                        initializer=_init_worker, initargs=(limits, PDF_MAX_MEMORY_MB))
+
+    def parse(self, data):
+        rec = self.pool.submit(process_one, ("upload.pdf", data)).result()
+        if not rec["ok"]:
+            # already "<ExceptionType>: message"
+            raise ValueError(rec["error"])
+        return {k: rec[k] for k in ("raw_text", "skills", "pages", "truncated", "overview")}
+
+    def score(self, resume_text, jd_text):
+        jd = parse_jd(jd_text)
+        skills = extract_skills_from_text(resume_text)
+        sem = self.embedder.similarity(resume_text, jd["raw_text"])
+        cov, matched, missing = compute_skill_coverage(skills, jd["required_skills"])
+        ats = compute_ats_score(resume_text, jd["required_skills"], skills)
+        return {
+            "semantic_similarity": sem, "skill_coverage": cov, "matched_skills": matched,
+            "missing_skills": missing, "overall_score": compute_overall_score(sem, cov),
+            "ats_score": ats["score"], "ats_details": ats["details"],
+        }
+
+    def rank(self, jd_text, resumes, top_k=10):
+        return rank_resumes(jd_text, resumes, top_k, embedder=self.embedder)
+
+class PayloadTooLarge(Exception):
+    pass
+
+def make_handler(service, max_body=MAX_BODY_MB * 1024 * 1024):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, code, payload, ctype="application/json"):
+            body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            if self.close_connection:
+                self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _body(self):
+            n = int(self.headers.get("Content-Length") or 0)
+            if n < 0:
+                raise ValueError("invalid Content-Length")
+            if n > max_body:
+                raise PayloadTooLarge(f"request body exceeds {max_body} bytes")
+            return self.rfile.read(n)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok"})
+            elif self.path == "/metrics":
+                self._send(200, metrics.render().encode("utf-8"), "text/plain; version=0.0.4")
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            try:
+                raw = self._body()
+                if self.path == "/parse":
+                    self._send(200, service.parse(raw))
+                    return
+                if self.path not in ("/score", "/rank"):
+                    self._send(404, {"error": "not found"})
+                    return
+                req = json.loads(raw or b"{}")
+                if not isinstance(req, dict):
+                    raise ValueError("request body must be a JSON object")
+                jd_text = _field(req, "jd_text", str)
+                if self.path == "/score":
+                    self._send(200, service.score(_field(req, "resume_text", str), jd_text))
+                else:
+                    resumes = [_resume_item(r, i) for i, r in enumerate(_field(req, "resumes", list))]
+                    self._send(200, service.rank(jd_text, resumes, _field(req, "top_k", int, 10)))
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+            except PayloadTooLarge as e:
+                # the unread body is still on the socket, so this connection can't be reused
+                self.close_connection = True
+                self._send(413, {"error": str(e)})
+            except Exception as e:
+                self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Headless resume parse/score/rank HTTP service.")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--parse-workers", type=int, default=None, help="PDF parsing processes (default: all cores)")
+    ap.add_argument("--max-batch", type=int, default=64, help="max texts per encode call")
+    ap.add_argument("--max-wait-ms", type=float, default=5, help="max time a text waits for its batch to fill")
+    ap.add_argument("--backend", choices=["sbert", "tfidf"], default=None)
+    ap.add_argument("--max-body-mb", type=float, default=MAX_BODY_MB, help="largest accepted request body")
+    args = ap.parse_args(argv)
+    service = ScoringService(args.parse_workers, args.max_batch, args.max_wait_ms, args.backend)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service, int(args.max_body_mb * 1024 * 1024)))
+    print(f"serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.pool.shutdown(cancel_futures=True)
+
+if __name__ == "__main__":
+    main()
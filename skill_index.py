@@ -0,0 +1,298 @@
+"""
+Inverted skill index: one bitmap of candidate slots per skill.
+
+    idx = SkillIndex.build((rec["source"], rec["skills"]) for rec in parsed)
+    idx.query('python AND docker AND NOT (java OR "spring boot")')   # -> candidate ids
+    idx.coverage(jd["required_skills"], min_coverage=0.5)            # -> {id: coverage}
+
+Boolean filters and JD coverage counts are whole-bitmap operations, so they do
+not touch per-candidate skill lists. Coverage uses bit-sliced counters: each
+required skill's bitmap is added into a binary counter whose i-th slice holds
+the candidates with bit i of their match count set, and "at least k" is a
+comparison over those slices.
+
+Bitmaps are pyroaring BitMaps when pyroaring is installed (compressed, fast
+for millions of candidates), otherwise Python ints used as bitsets; with ints,
+inserts and deletes are buffered per skill and OR'd in (or masked out) on the
+next query. Int bitsets take len(index) / 8 bytes per skill, so install
+pyroaring for large indexes.
+Skills, query terms and required skills all go through
+skills_db.canonical_skill, as in src.matcher.compute_skill_coverage, so
+aliases such as "js" or "k8s" resolve to the canonical skill.
+"""
+import re
+
+import numpy as np
+
+from src.skills_db import canonical_skill
+
+try:
+    from pyroaring import BitMap
+except ImportError:
+    BitMap = None
+
+_ALIVE = None  # key of the bitmap holding every live slot
+_TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+_OPERATORS = {"AND", "OR", "NOT"}
+
+class SkillIndex:
+    def __init__(self, roaring=None):
+        """roaring: None (pyroaring if installed), True or False."""
+        if roaring and BitMap is None:
+            raise ImportError("pyroaring is not installed")
+        self.roaring = BitMap is not None if roaring is None else roaring
+        self._ids = []        # slot -> candidate id, None once removed
+        self._slot = {}       # candidate id -> slot
+        self._skills = []     # slot -> frozenset of skills
+        self._bits = {}       # skill -> bitmap (int backend: without pending changes)
+        self._pending = {}    # int backend only: skill -> (slots to set, slots to clear)
+
+    @classmethod
+    def build(cls, records, roaring=None):
+        """Index (candidate id, skills) pairs."""
+        idx = cls(roaring)
+        for cid, skills in records:
+            idx.add(cid, skills)
+        return idx
+
+    def __len__(self):
+        return len(self._slot)
+
+    def __contains__(self, cid):
+        return cid in self._slot
+
+    # ---- bitmap primitives ----
+    def _empty(self):
+        return BitMap() if self.roaring else 0
+
+    def _change(self, key, slot, on):
+        if self.roaring:
+            bm = self._bits.get(key)
+            if bm is None:
+                bm = self._bits[key] = BitMap()
+            if on:
+                bm.add(slot)
+            else:
+                bm.discard(slot)
+            return
+        adds, clears = self._pending.setdefault(key, (set(), set()))
+        (adds if on else clears).add(slot)
+        (clears if on else adds).discard(slot)
+
+    @staticmethod
+    def _delta(slots):
+        """Int bitset of the given slots, built from only the bytes they span."""
+        s = np.fromiter(slots, dtype=np.int64, count=len(slots))
+        lo = int(s.min()) >> 3
+        buf = np.zeros((int(s.max()) >> 3) - lo + 1, dtype=np.uint8)
+        np.bitwise_or.at(buf, (s >> 3) - lo, np.left_shift(1, s & 7).astype(np.uint8))
+        return int.from_bytes(buf.tobytes(), "little") << (lo << 3)
+
+    def _flush(self):
+        # each key costs its pending slots plus one word-level int OR/AND-NOT
+        for key, (adds, clears) in self._pending.items():
+            bm = self._bits.get(key, 0)
+            if adds:
+                bm |= self._delta(adds)
+            if clears:
+                bm &= ~self._delta(clears)
+            self._bits[key] = bm
+        self._pending.clear()
+
+    def _get(self, key):
+        self._flush()
+        bm = self._bits.get(key)
+        return self._empty() if bm is None else bm
+
+    def _andnot(self, a, b):
+        return a - b if self.roaring else a & ~b
+
+    def _count(self, bm):
+        return len(bm) if self.roaring else bm.bit_count()
+
+    def _slots(self, bm):
+        if self.roaring:
+            return bm
+        buf = np.frombuffer(bm.to_bytes((len(self._ids) + 7) // 8, "little"), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(buf, bitorder="little")).tolist()
+
+    # ---- maintenance ----
+    def add(self, cid, skills):
+        """Index a candidate; re-adding an existing id replaces its skills."""
+        skills = frozenset(canonical_skill(s) for s in (skills or []))
+        slot = self._slot.get(cid)
+        if slot is None:
+            slot = self._slot[cid] = len(self._ids)
+            self._ids.append(cid)
+            self._skills.append(frozenset())
+            self._change(_ALIVE, slot, True)
+        old = self._skills[slot]
+        for s in old - skills:
+            self._change(s, slot, False)
+        for s in skills - old:
+            self._change(s, slot, True)
+        self._skills[slot] = skills
+
+    def remove(self, cid):
+        """Drop a candidate; returns False if it was not indexed. Slots are not reused."""
+        slot = self._slot.pop(cid, None)
+        if slot is None:
+            return False
+        for s in self._skills[slot]:
+            self._change(s, slot, False)
+        self._change(_ALIVE, slot, False)
+        self._ids[slot] = None
+        self._skills[slot] = frozenset()
+        return True
+
+    def skills_of(self, cid):
+        return set(self._skills[self._slot[cid]])
+
+    def skill_counts(self):
+        """{skill: number of candidates with it}."""
+        self._flush()
+        return {s: self._count(bm) for s, bm in self._bits.items() if s is not _ALIVE and bm}
+
+    # ---- boolean queries ----
+    def _parse(self, expr):
+        tokens = []
+        pos = 0
+        expr = expr.strip()
+        while pos < len(expr):
+            m = _TOKEN_RE.match(expr, pos)
+            if not m or m.end() == pos:
+                raise ValueError(f"bad skill query at {pos}: {expr[pos:]!r}")
+            pos = m.end()
+            lparen, rparen, quoted, word = m.groups()
+            if lparen or rparen:
+                tokens.append(lparen or rparen)
+            elif quoted is not None:
+                tokens.append(("skill", quoted))
+            elif word in _OPERATORS:
+                tokens.append(word)
+            elif tokens and isinstance(tokens[-1], tuple) and tokens[-1][0] == "word":
+                # consecutive bare words form one skill: machine learning AND python
+                tokens[-1] = ("word", tokens[-1][1] + " " + word)
+            else:
+                tokens.append(("word", word))
+        return tokens
+
+    def query_bitmap(self, expr):
+        """Bitmap of the slots matching a boolean skill expression (AND, OR, NOT, parentheses, "quoted skills")."""
+        tokens = self._parse(expr)
+        pos = 0
+
+        def peek():
+            return tokens[pos] if pos < len(tokens) else None
+
+        def take(expected=None):
+            nonlocal pos
+            tok = peek()
+            if tok is None or (expected and tok != expected):
+                raise ValueError(f"bad skill query: expected {expected or 'a skill'} in {expr!r}")
+            pos += 1
+            return tok
+
+        def disjunction():
+            bm = conjunction()
+            while peek() == "OR":
+                take()
+                bm = bm | conjunction()
+            return bm
+
+        def conjunction():
+            bm = negation()
+            while peek() == "AND":
+                take()
+                bm = bm & negation()
+            return bm
+
+        def negation():
+            if peek() == "NOT":
+                take()
+                return self._andnot(self._get(_ALIVE), negation())
+            if peek() == "(":
+                take()
+                bm = disjunction()
+                take(")")
+                return bm
+            tok = take()
+            if not isinstance(tok, tuple):
+                raise ValueError(f"bad skill query: unexpected {tok!r} in {expr!r}")
+            return self._get(canonical_skill(tok[1]))
+
+        result = disjunction()
+        if pos != len(tokens):
+            raise ValueError(f"bad skill query: unexpected {tokens[pos]!r} in {expr!r}")
+        # copy, so callers can't mutate the index's own bitmaps
+        return result | self._empty()
+
+    def query(self, expr):
+        """Candidate ids matching the expression, in insertion order."""
+        return [self._ids[s] for s in self._slots(self.query_bitmap(expr))]
+
+    def count(self, expr):
+        return self._count(self.query_bitmap(expr))
+
+    # ---- coverage against a JD ----
+    def count_slices(self, required_skills):
+        """Bit slices of the per-candidate match count: slice i holds the slots with bit i set."""
+        slices = []
+        for s in set(canonical_skill(k) for k in (required_skills or [])):
+            carry = self._get(s)
+            for i in range(len(slices)):
+                if not carry:
+                    break
+                slices[i], carry = slices[i] ^ carry, slices[i] & carry
+            if carry:
+                slices.append(carry)
+        return slices
+
+    def _at_least(self, slices, k):
+        alive = self._get(_ALIVE)
+        if k <= 0:
+            return alive | self._empty()
+        if k >= 1 << len(slices):
+            return self._empty()
+        gt, eq = self._empty(), alive
+        for i in reversed(range(len(slices))):
+            if k >> i & 1:
+                eq = eq & slices[i]
+            else:
+                gt = gt | (eq & slices[i])
+                eq = self._andnot(eq, slices[i])
+        return gt | eq
+
+    def at_least(self, required_skills, k):
+        """Bitmap of the candidates having at least k of the required skills."""
+        return self._at_least(self.count_slices(required_skills), k)
+
+    def coverage_histogram(self, required_skills):
+        """{matched skill count: number of candidates}, over live candidates."""
+        n = len(set(canonical_skill(s) for s in (required_skills or [])))
+        slices = self.count_slices(required_skills)
+        hist, above = {}, 0
+        for k in range(n, -1, -1):
+            at_least = self._count(self._at_least(slices, k))
+            hist[k] = at_least - above
+            above = at_least
+        return dict(sorted(hist.items()))
+
+    def coverage(self, required_skills, min_coverage=0.0):
+        """
+        {candidate id: coverage} for candidates whose compute_skill_coverage against
+        required_skills is >= min_coverage; only those candidates are materialised.
+        """
+        n = len(set(canonical_skill(s) for s in (required_skills or [])))
+        if n == 0:
+            return {cid: 0 for cid in self._slot} if min_coverage <= 0 else {}
+        k = next((k for k in range(n + 1) if k / n >= min_coverage), None)
+        if k is None:
+            return {}
+        slices = self.count_slices(required_skills)
+        keep = self._at_least(slices, k)
+        counts = {}
+        for i, sl in enumerate(slices):
+            for slot in self._slots(sl & keep):
+                counts[slot] = counts.get(slot, 0) + (1 << i)
+        return {self._ids[slot]: counts.get(slot, 0) / n for slot in self._slots(keep)}
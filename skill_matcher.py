@@ -0,0 +1,178 @@
+from collections import deque
+from functools import lru_cache
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over lower-cased skill terms with word-boundary checks.
+    One left-to-right pass over the text finds every term, so cost is roughly
+    independent of taxonomy size. `terms` is an iterable of strings, or a dict
+    mapping surface form -> canonical name (aliases).
+    """
+
+    def __init__(self, terms):
+        if isinstance(terms, dict):
+            pairs = [(s.lower(), c.lower()) for s, c in terms.items()]
+        else:
+            pairs = [(s.lower(), s.lower()) for s in terms]
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]   # per state: (term length, canonical, needs start boundary, needs end boundary)
+        for surface, canonical in pairs:
+            if surface:
+                self._add(surface, canonical)
+        self._build()
+
+    def _add(self, surface, canonical):
+        state = 0
+        for ch in surface:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(surface), canonical, surface[0].isalnum(), surface[-1].isalnum()))
+
+    def _build(self):
+        # root children fail to the root; deeper states are resolved breadth-first
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0) if state else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    # ---- flat tables (src.taxonomy stores these so workers skip the build) ----
+    def to_tables(self, canonical_index):
+        """
+        Flat arrays describing the automaton; canonical_index maps a canonical name
+        to the integer stored for it. Outputs already include the fail chain.
+        """
+        edge_start, edge_chars, targets, out_start, outs = [0], [], [], [0], []
+        for g, o in zip(self._goto, self._out):
+            for ch, nxt in sorted(g.items()):
+                edge_chars.append(ch)
+                targets.append(nxt)
+            edge_start.append(len(targets))
+            for length, canonical, wb_start, wb_end in o:
+                outs.extend((length, canonical_index[canonical], wb_start | wb_end << 1))
+            out_start.append(len(outs) // 3)
+        return {"edge_start": edge_start, "edge_chars": "".join(edge_chars), "targets": targets,
+                "fail": self._fail, "out_start": out_start, "outs": outs}
+
+    @classmethod
+    def from_tables(cls, tables, canonical_name):
+        """
+        Matcher over to_tables() output (sequences may be memory-mapped); states are
+        turned back into dicts only when a text first reaches them.
+        canonical_name maps the stored integer back to the canonical name.
+        """
+        self = cls.__new__(cls)
+        n = len(tables["fail"])
+        self._tables = tables
+        self._canonical_name = canonical_name
+        self._goto = [None] * n
+        self._fail = tables["fail"]
+        self._out = [None] * n
+        return self
+
+    def _load_goto(self, state):
+        t = self._tables
+        s, e = t["edge_start"][state], t["edge_start"][state + 1]
+        g = self._goto[state] = dict(zip(t["edge_chars"][s:e], t["targets"][s:e]))
+        return g
+
+    def _load_out(self, state):
+        t = self._tables
+        s, e = t["out_start"][state], t["out_start"][state + 1]
+        outs, name = t["outs"], self._canonical_name
+        o = self._out[state] = [(outs[3 * k], name(outs[3 * k + 1]), bool(outs[3 * k + 2] & 1), bool(outs[3 * k + 2] & 2))
+                                for k in range(s, e)]
+        return o
+
+    def iter_matches(self, text, lowered=False):
+        """Yield (start, end, canonical) for every boundary-respecting occurrence."""
+        t = (text or "") if lowered else (text or "").lower()
+        n = len(t)
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(t):
+            while True:
+                g = goto[state]
+                if g is None:
+                    g = self._load_goto(state)
+                if not state or ch in g:
+                    break
+                state = fail[state]
+            state = g.get(ch, 0)
+            o = out[state]
+            if o is None:
+                o = self._load_out(state)
+            if not o:
+                continue
+            for length, canonical, wb_start, wb_end in o:
+                start = i - length + 1
+                if wb_start and start > 0 and t[start - 1].isalnum():
+                    continue
+                if wb_end and i + 1 < n and t[i + 1].isalnum():
+                    continue
+                yield start, i + 1, canonical
+
+    def find(self, text, lowered=False):
+        """Sorted list of distinct canonical terms present in text (pass lowered=True if already lower-case)."""
+        return sorted({m[2] for m in self.iter_matches(text, lowered)})
+
+@lru_cache(maxsize=256)
+def _cached(terms):
+    return SkillMatcher(terms)
+
+def get_matcher(terms):
+    """Shared compiled matcher for a collection of terms (memoised per term set)."""
+    return _cached(tuple(sorted({t.lower() for t in terms if t})))
+
+class _CanonicalFilter:
+    """default_matcher() restricted to a set of canonical names, plus plain matching for names it doesn't know."""
+
+    def __init__(self, known, unknown):
+        self.known = known
+        self.extra = get_matcher(unknown) if unknown else None
+
+    def iter_matches(self, text, lowered=False):
+        t = (text or "") if lowered else (text or "").lower()
+        for m in default_matcher().iter_matches(t, lowered=True):
+            if m[2] in self.known:
+                yield m
+        if self.extra is not None:
+            yield from self.extra.iter_matches(t, lowered=True)
+
+    def find(self, text, lowered=False):
+        return sorted({m[2] for m in self.iter_matches(text, lowered)})
+
+@lru_cache(maxsize=256)
+def _cached_canonical(wanted):
+    from src.skills_db import lookup_skill
+    known = frozenset(c for c in wanted if lookup_skill(c) == c)
+    return _CanonicalFilter(known, wanted - known)
+
+def canonical_matcher(terms):
+    """
+    Matcher for `terms` after canonical_skill(), that also finds their taxonomy
+    aliases and yields canonical names ("k8s" -> "kubernetes"), like default_matcher().
+    """
+    from src.skills_db import canonical_skill
+    return _cached_canonical(frozenset(canonical_skill(t) for t in terms if t))
+
+@lru_cache(maxsize=1)
+def default_matcher():
+    """Matcher over the configured skill taxonomy, yielding canonical names for aliases."""
+    from src.skills_db import get_taxonomy, skill_terms
+    tax = get_taxonomy()
+    if tax is not None:
+        return tax.matcher()
+    return SkillMatcher(skill_terms())
@@ -1,3 +1,5 @@
+import os
+from functools import lru_cache
 
 CORE=[
     "python","java","c++","javascript","html","css","react","node.js","django","flask",
@@ -8,3 +10,44 @@ CORE=[
 ]
 SOFT=["communication","teamwork","leadership","problem solving","time management","adaptability","creativity"]
 ALL_SKILLS=[s.lower() for s in CORE+SOFT]
+
+# alias -> canonical, for the built-in list
+ALIASES={
+    "k8s":"kubernetes","sklearn":"scikit-learn","nodejs":"node.js","postgres":"postgresql",
+    "reactjs":"react","react.js":"react","ml":"machine learning","dl":"deep learning",
+    "restful api":"rest api","amazon web services":"aws","google cloud":"gcp"
+}
+
+# compiled taxonomy artifact (see src.taxonomy); when set it replaces the built-in list
+TAXONOMY_PATH=os.environ.get("SKILLS_TAXONOMY")
+
+def get_taxonomy():
+    """The compiled taxonomy, loaded lazily on first use; None when not configured."""
+    if not TAXONOMY_PATH:
+        return None
+    from src.taxonomy import load_taxonomy
+    return load_taxonomy(TAXONOMY_PATH)
+
+@lru_cache(maxsize=1)
+def skill_terms():
+    """surface form -> canonical skill name, including aliases."""
+    tax = get_taxonomy()
+    if tax is not None:
+        return tax.term_map()
+    terms = {s: s for s in ALL_SKILLS}
+    terms.update({a: c for a, c in ALIASES.items() if c in terms})
+    return terms
+
+@lru_cache(maxsize=65536)
+def lookup_skill(term):
+    """Canonical name for a skill name or alias, or None if unknown."""
+    t = (term or "").strip().lower()
+    tax = get_taxonomy()
+    if tax is not None:
+        # binary search over the mmap; avoids materialising term_map() in every worker
+        return tax.canonical(t)
+    return skill_terms().get(t)
+
+def canonical_skill(term):
+    t = (term or "").strip().lower()
+    return lookup_skill(t) or t
@@ -0,0 +1,207 @@
+"""
+Compiled skill taxonomy.
+
+Source taxonomies (CSV with id,name,aliases columns or a JSON list of
+{"id", "name", "aliases"} objects) are compiled into a small binary artifact
+that is memory-mapped on load, so workers get canonical skills and aliases in
+milliseconds without re-parsing the source.
+
+    python -m src.taxonomy build skills.csv skills.bin --version 3
+
+Artifact layout (little-endian):
+    header   magic "SKTX", format u16, reserved u16, version u32,
+             n_skills u32, n_terms u32, blob_size u32
+    skills   n_skills x (id_off u32, id_len u32, name_off u32, name_len u32)
+    terms    n_terms  x (term_off u32, term_len u32, skill u32), sorted by term bytes
+    blob     utf-8 strings, zero-padded to a multiple of 4 bytes
+    matcher  (format 2) the compiled src.skill_matcher automaton:
+             n_states u32, n_edges u32, n_outs u32, reserved u32,
+             edge_start (n_states + 1) u32, targets n_edges u32, fail n_states u32,
+             out_start (n_states + 1) u32, outs n_outs x (length u32, skill u32, flags u32),
+             edge_chars n_edges x utf-32
+    Workers load the matcher's arrays as-is and expand a state only when text
+    reaches it, instead of rebuilding the automaton from every term.
+"""
+import argparse
+import csv
+import json
+import mmap
+import struct
+import sys
+from array import array
+from functools import lru_cache
+
+MAGIC = b"SKTX"
+FORMAT = 2
+_READABLE = (1, 2)   # format 1 has no matcher section; it is built on load
+_HEADER = struct.Struct("<4sHHIIII")
+_MATCHER = struct.Struct("<IIII")
+_SKILL = struct.Struct("<IIII")
+_TERM = struct.Struct("<III")
+
+def _read_source(path):
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = []
+            for r in csv.DictReader(f):
+                aliases = r.get("aliases") or ""
+                r["aliases"] = [a for a in aliases.replace(";", "|").split("|")]
+                rows.append(r)
+    for r in rows:
+        name = (r.get("name") or "").strip().lower()
+        if not name:
+            continue
+        sid = (r.get("id") or name).strip()
+        aliases = [a.strip().lower() for a in (r.get("aliases") or []) if a and a.strip()]
+        yield sid, name, aliases
+
+def build_taxonomy(src_path, out_path, version=1):
+    skills, terms = [], {}
+    for sid, name, aliases in _read_source(src_path):
+        idx = len(skills)
+        skills.append((sid, name))
+        for t in [name] + aliases:
+            # first definition wins; a later skill cannot steal an existing alias
+            terms.setdefault(t.encode("utf-8"), idx)
+
+    blob = bytearray()
+    def put(s):
+        b = s.encode("utf-8") if isinstance(s, str) else s
+        off = len(blob)
+        blob.extend(b)
+        return off, len(b)
+
+    skill_rows = [_SKILL.pack(*put(sid), *put(name)) for sid, name in skills]
+    term_rows = [_TERM.pack(*put(t), terms[t]) for t in sorted(terms)]
+    blob.extend(b"\0" * (-len(blob) % 4))
+
+    from src.skill_matcher import SkillMatcher
+    name_index = {}
+    for i, (_, name) in enumerate(skills):
+        name_index.setdefault(name, i)
+    matcher = SkillMatcher({t.decode("utf-8"): skills[i][1] for t, i in terms.items()})
+    tables = matcher.to_tables(name_index)
+
+    with open(out_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT, 0, version, len(skills), len(term_rows), len(blob)))
+        f.writelines(skill_rows)
+        f.writelines(term_rows)
+        f.write(blob)
+        f.write(_MATCHER.pack(len(tables["fail"]), len(tables["targets"]), len(tables["outs"]) // 3, 0))
+        for key in ("edge_start", "targets", "fail", "out_start", "outs"):
+            f.write(_u32(tables[key]).tobytes())
+        f.write(tables["edge_chars"].encode("utf-32-le"))
+    return len(skills), len(term_rows)
+
+def _u32(values):
+    a = array("I", values)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a
+
+class Taxonomy:
+    """Read-only view over a compiled taxonomy artifact."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt, _, self.version, self.n_skills, self.n_terms, blob_size = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or fmt not in _READABLE:
+            raise ValueError(f"{path} is not a compiled skill taxonomy (format {FORMAT})")
+        self.format = fmt
+        self._skills_at = _HEADER.size
+        self._terms_at = self._skills_at + self.n_skills * _SKILL.size
+        self._blob_at = self._terms_at + self.n_terms * _TERM.size
+        self._matcher_at = self._blob_at + blob_size if fmt >= 2 else None
+
+    def __len__(self):
+        return self.n_skills
+
+    def _str(self, off, ln):
+        start = self._blob_at + off
+        return self._mm[start:start + ln].decode("utf-8")
+
+    def skill(self, i):
+        """(id, canonical name) of skill i."""
+        id_off, id_len, name_off, name_len = _SKILL.unpack_from(self._mm, self._skills_at + i * _SKILL.size)
+        return self._str(id_off, id_len), self._str(name_off, name_len)
+
+    def _term(self, j):
+        off, ln, skill = _TERM.unpack_from(self._mm, self._terms_at + j * _TERM.size)
+        start = self._blob_at + off
+        return self._mm[start:start + ln], skill
+
+    def lookup(self, term):
+        """(id, canonical name) for a skill name or alias, or None."""
+        key = term.strip().lower().encode("utf-8")
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            t, skill = self._term(mid)
+            if t == key:
+                return self.skill(skill)
+            if t < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def canonical(self, term):
+        hit = self.lookup(term)
+        return hit[1] if hit else None
+
+    def skill_names(self):
+        return [self.skill(i)[1] for i in range(self.n_skills)]
+
+    def term_map(self):
+        """surface form -> canonical name, for every name and alias."""
+        names = self.skill_names()
+        out = {}
+        for j in range(self.n_terms):
+            t, skill = self._term(j)
+            out[t.decode("utf-8")] = names[skill]
+        return out
+
+    def _matcher_tables(self):
+        n_states, n_edges, n_outs, _ = _MATCHER.unpack_from(self._mm, self._matcher_at)
+        pos = self._matcher_at + _MATCHER.size
+        tables = {}
+        for key, n in (("edge_start", n_states + 1), ("targets", n_edges), ("fail", n_states),
+                       ("out_start", n_states + 1), ("outs", 3 * n_outs)):
+            a = array("I")
+            a.frombytes(self._mm[pos:pos + 4 * n])
+            if sys.byteorder != "little":
+                a.byteswap()
+            tables[key] = a
+            pos += 4 * n
+        tables["edge_chars"] = self._mm[pos:pos + 4 * n_edges].decode("utf-32-le")
+        return tables
+
+    def matcher(self):
+        """SkillMatcher over every name and alias, yielding canonical names."""
+        from src.skill_matcher import SkillMatcher
+        if self._matcher_at is None:
+            return SkillMatcher(self.term_map())
+        return SkillMatcher.from_tables(self._matcher_tables(), lru_cache(maxsize=None)(lambda i: self.skill(i)[1]))
+
+@lru_cache(maxsize=8)
+def load_taxonomy(path):
+    return Taxonomy(path)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compile a skill taxonomy into a memory-mappable artifact.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build")
+    b.add_argument("source", help="CSV (id,name,aliases) or JSON list")
+    b.add_argument("output")
+    b.add_argument("--version", type=int, default=1)
+    args = ap.parse_args(argv)
+    n_skills, n_terms = build_taxonomy(args.source, args.output, args.version)
+    print(f"wrote {args.output}: {n_skills} skills, {n_terms} terms, version {args.version}")
+
+if __name__ == "__main__":
+    main()
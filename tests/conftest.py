@@ -0,0 +1,15 @@
+# The repository root is the `src` package (modules import each other as
+# src.<module>). Put its parent on sys.path; if the checkout directory is not
+# named "src", register the root under that name instead.
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if os.path.basename(ROOT) == "src":
+    sys.path.insert(0, os.path.dirname(ROOT))
+elif "src" not in sys.modules:
+    pkg = types.ModuleType("src")
+    pkg.__path__ = [ROOT]
+    sys.modules["src"] = pkg
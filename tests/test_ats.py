@@ -0,0 +1,21 @@
+from src.ats import compute_ats_score, keyword_density
+from src.matcher import compute_skill_coverage
+from src.resume_parser import extract_skills_from_text
+
+RESUME = "Skills\nDeployed services on k8s with Docker and ML pipelines in sklearn."
+
+def test_keyword_density_agrees_with_skill_coverage_on_aliases():
+    jd = ["kubernetes", "docker", "machine learning", "java"]
+    cov, matched, missing = compute_skill_coverage(extract_skills_from_text(RESUME), jd)
+    kd = keyword_density(RESUME, jd)
+    assert kd["all_matched"] == matched == ["docker", "kubernetes", "machine learning"]
+    assert kd["missing"] == missing == ["java"]
+    assert kd["overall_coverage"] == cov
+
+def test_alias_in_jd_is_canonicalised():
+    kd = keyword_density(RESUME, ["K8s", "kubernetes"])
+    assert kd["all_matched"] == ["kubernetes"]
+    assert kd["overall_coverage"] == 1.0
+
+def test_empty_jd_scores():
+    assert compute_ats_score(RESUME, [], [])["details"]["keyword_density"]["overall_coverage"] == 0
@@ -0,0 +1,28 @@
+from src.ats_batch import batch_ats_scores, check_parity
+from src.jd_parser import parse_jd
+
+RESUMES = [
+    "Jane Doe\nSummary\nBuilt and deployed services on k8s with Docker.\nSkills\npython, sql, ML",
+    "EXPERIENCE\nWas responsible for reporting. Worked on java and spring apps.\nEducation\nB.Tech 2020",
+    "Projects\nImplemented a C++ engine; optimized node.js APIs; trained PyTorch models on AWS.",
+    "",
+    "   \n\n  ",
+    "skills: kubernetes kubernetes kubernetes " * 40,
+]
+
+JD_TEXTS = [
+    "We need a Python engineer with Docker, Kubernetes and SQL; machine learning is a plus.",
+    "Java developer: spring, sql, aws, communication and teamwork.",
+    "",
+    "   \n  ",
+]
+
+JD_SKILLS = [parse_jd(t)["required_skills"] for t in JD_TEXTS] + [
+    [], ["", "  "], ["k8s", "kubernetes", "sklearn"], ["c++", "node.js", "ci/cd", "not-a-skill"],
+]
+
+def test_batch_scores_match_scalar_on_fixed_corpus():
+    assert check_parity(RESUMES, JD_SKILLS) == []
+
+def test_batch_shape():
+    assert batch_ats_scores(RESUMES, JD_SKILLS)["score"].shape == (len(RESUMES), len(JD_SKILLS))
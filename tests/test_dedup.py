@@ -0,0 +1,25 @@
+import numpy as np
+
+from src.dedup import NearDuplicateIndex
+
+def _text(seed, n=300):
+    rng = np.random.default_rng(seed)
+    return " ".join(f"w{i}" for i in rng.integers(0, 5000, n))
+
+def test_near_duplicates_join_one_cluster():
+    dd = NearDuplicateIndex(threshold=0.8)
+    base = _text(0)
+    assert dd.add("a", base) is None
+    assert dd.add("b", _text(1)) is None
+    assert dd.add("c", base + " w1 w2") == "a"
+    assert dd.clusters() == {"a": ["a", "c"]}
+
+def test_large_clone_cluster_keeps_buckets_small():
+    dd = NearDuplicateIndex(threshold=0.85)
+    base = _text(0)
+    for i in range(2000):
+        assert dd.add(f"clone-{i}", base) == ("clone-0" if i else None)
+    assert max(len(ids) for band in dd._buckets for ids in band.values()) == 1
+    assert dd.query(base) == ["clone-0"]
+    assert dd.add("other", _text(1)) is None
+    assert len(dd.clusters()["clone-0"]) == 2000
@@ -0,0 +1,40 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.embedding_cache import EmbeddingCache
+
+def _vec(x, dim=3):
+    return np.full(dim, x, dtype=np.float32)
+
+def test_disk_roundtrip(tmp_path):
+    c = EmbeddingCache("m", path=str(tmp_path))
+    c.put_many(["a", "b"], [_vec(1), _vec(2)])
+    c2 = EmbeddingCache("m", path=str(tmp_path))
+    assert np.array_equal(c2.get("b"), _vec(2))
+    assert c2.stats()["disk_hits"] == 1
+
+def test_recovers_from_crash_between_appends(tmp_path):
+    c = EmbeddingCache("m", path=str(tmp_path))
+    c.put_many(["a"], [_vec(1)])
+    # crash after the vector row was written but before its key: stray row plus half a row
+    with open(tmp_path / "vectors.f32", "ab") as f:
+        f.write(_vec(9).tobytes() + b"\0\0")
+    with open(tmp_path / "keys.txt", "a") as f:
+        f.write("deadbeef")  # torn key line, no newline
+
+    c2 = EmbeddingCache("m", path=str(tmp_path))
+    assert c2.stats()["disk_items"] == 1
+    assert os.path.getsize(tmp_path / "vectors.f32") == 3 * 4
+    c2.put_many(["b"], [_vec(2)])
+
+    c3 = EmbeddingCache("m", path=str(tmp_path))
+    assert np.array_equal(c3.get("a"), _vec(1))
+    assert np.array_equal(c3.get("b"), _vec(2))
+    assert c3.stats()["disk_items"] == 2
+
+def test_model_mismatch_rejected(tmp_path):
+    EmbeddingCache("m", path=str(tmp_path)).put_many(["a"], [_vec(1)])
+    with pytest.raises(ValueError):
+        EmbeddingCache("other", path=str(tmp_path))
@@ -0,0 +1,40 @@
+import inspect
+import io
+import json
+import zipfile
+
+from src import ingest as ingest_mod
+from src.bench_corpus import make_pdf
+from src.resume_parser import PDF_TIMEOUT
+
+def test_sources_are_read_a_bounded_window_ahead(tmp_path, monkeypatch):
+    pulled = []
+    def sources(path):
+        for i in range(60):
+            pulled.append(i)
+            yield f"r{i}.pdf", b"not a pdf"
+    ahead = []
+    class Writer:
+        written = 0
+        def write(self, rec):
+            self.written += 1
+            ahead.append(len(pulled) - self.written)
+        def close(self):
+            pass
+    monkeypatch.setattr(ingest_mod, "iter_sources", sources)
+    monkeypatch.setattr(ingest_mod, "open_writer", lambda path: Writer())
+    summary = ingest_mod.ingest("unused", "unused", workers=1, chunksize=2, log=io.StringIO())
+    assert summary["docs"] == summary["failed"] == 60
+    # two chunks per worker in flight, plus the chunk being handed out
+    assert max(ahead) <= 3 * 2
+
+def test_ingest_zip_defaults_to_the_cli_timeout(tmp_path):
+    archive = tmp_path / "a.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.pdf", make_pdf([["Alice Smith python docker"]]))
+        zf.writestr("notes.txt", "skipped")
+    out = tmp_path / "out.jsonl"
+    summary = ingest_mod.ingest(str(archive), str(out), workers=1, log=io.StringIO())
+    assert summary["docs"] == 1 and summary["failed"] == 0
+    assert [json.loads(ln)["skills"] for ln in open(out)] == [["docker", "python"]]
+    assert inspect.signature(ingest_mod.ingest).parameters["timeout"].default == PDF_TIMEOUT
@@ -0,0 +1,49 @@
+import types
+
+import pytest
+
+from src import skills_db
+from src.job_runner import Checkpoint, job_fingerprint
+from src.taxonomy import build_taxonomy
+
+JDS = [("jd0", "python developer")]
+EMB = types.SimpleNamespace(name="m", use_sbert=False)
+
+def test_fingerprint_covers_limits_and_taxonomy(tmp_path, monkeypatch):
+    base = job_fingerprint(JDS, EMB)
+    assert job_fingerprint(JDS, EMB) == base
+    assert job_fingerprint(JDS, EMB, max_pages=3) != base
+    assert job_fingerprint(JDS, EMB, max_chars=1000) != base
+
+    src = tmp_path / "skills.csv"
+    src.write_text("id,name,aliases\nS1,python,py\n")
+    fps = []
+    for version in (1, 2):
+        out = tmp_path / f"v{version}.bin"
+        build_taxonomy(str(src), str(out), version=version)
+        monkeypatch.setattr(skills_db, "TAXONOMY_PATH", str(out))
+        fps.append(job_fingerprint(JDS, EMB))
+    assert len({base, *fps}) == 3
+
+def test_checkpoint_survives_a_torn_last_line(tmp_path):
+    path = str(tmp_path / "out.ckpt")
+    ck = Checkpoint(path, "fp")
+    ck.commit(["a"], 10)
+    ck.close()
+    with open(path, "a") as f:
+        f.write('{"sources": ["b"], "off')   # killed mid-append
+
+    for run, (src, offset) in enumerate([("b", 20), ("c", 30)]):
+        ck = Checkpoint(path, "fp")
+        assert ck.offset == 10 * (run + 1)
+        ck.commit([src], offset)
+        ck.close()
+    ck = Checkpoint(path, "fp")
+    assert ck.done == {"a", "b", "c"} and ck.offset == 30
+    ck.close()
+
+def test_checkpoint_rejects_another_job(tmp_path):
+    path = str(tmp_path / "out.ckpt")
+    Checkpoint(path, "fp").close()
+    with pytest.raises(ValueError):
+        Checkpoint(path, "other")
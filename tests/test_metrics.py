@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from src import metrics
+from src.embedder import TextEmbedder
+from src.resume_parser import extract_overview_fields, generate_overview
+
+@pytest.fixture
+def recording():
+    was = metrics.enabled()
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.enable(was)
+    metrics.reset()
+
+def _count(stage):
+    for line in metrics.render().splitlines():
+        if line.startswith(f'resume_stage_seconds_count{{stage="{stage}"}}'):
+            return int(float(line.split()[-1]))
+    return 0
+
+def test_app_call_sites_are_timed(recording):
+    # the app reads overview fields from the store and scores cached vectors
+    extract_overview_fields("Jane Doe\nSkills\npython", ["python"])
+    TextEmbedder.vector_similarity(np.ones(4, dtype=np.float32) / 2, np.ones(4, dtype=np.float32) / 2)
+    assert _count("generate_overview") == 1
+    assert _count("similarity") == 1
+
+def test_generate_overview_is_timed_once(recording):
+    generate_overview("Jane Doe\nSkills\npython", ["python"])
+    assert _count("generate_overview") == 1
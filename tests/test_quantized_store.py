@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.quantized_store import QuantizedStore
+
+def _rows(n, dim=8, seed=0):
+    v = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_roundtrip_scores(tmp_path, dtype):
+    v = _rows(20)
+    QuantizedStore(str(tmp_path), dtype=dtype).add(v)
+    store = QuantizedStore(str(tmp_path))
+    assert len(store) == 20 and store.dtype == dtype
+    assert np.allclose(store.scores(v[3]), v @ v[3], atol=0.02)
+    assert store.top_k(v[3], 1)[0][0] == 3
+
+def test_reopen_empty_store(tmp_path):
+    QuantizedStore(str(tmp_path), dim=8, dtype="int8")
+    store = QuantizedStore(str(tmp_path))
+    assert len(store) == 0 and store.dim == 8
+    assert store.add(_rows(2)) == 0 and len(store) == 2
+
+def test_recovers_from_crash_between_appends(tmp_path):
+    v = _rows(5)
+    store = QuantizedStore(str(tmp_path), dtype="int8")
+    store.add(v[:3])
+    # crash after the vector rows were written, before their scales
+    with open(tmp_path / "vectors.bin", "ab") as f:
+        f.write(np.ones((2, 8), dtype=np.int8).tobytes() + b"\1")
+
+    store = QuantizedStore(str(tmp_path))
+    assert len(store) == 3
+    assert os.path.getsize(tmp_path / "vectors.bin") == 3 * 8
+    assert store.add(v[3:]) == 3
+    store = QuantizedStore(str(tmp_path))
+    assert len(store) == 5
+    assert np.allclose(store.scores(v[4]), v @ v[4], atol=0.02)
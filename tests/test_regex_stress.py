@@ -0,0 +1,28 @@
+import time
+
+from src.regex_stress import MODULES, PATHOLOGICAL, _cases, fuzz_clean_text, make_input, stress
+
+BUDGET = 2.0
+
+def _best_per_mb(case, kind, size, repeat=3):
+    fn = dict(_cases(MODULES))[case]
+    text = make_input(PATHOLOGICAL[kind], size)
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best * (1 << 20) / size
+
+def test_patterns_stay_within_the_per_mb_budget():
+    # 16-64 KiB is enough for a quadratic pattern to blow the budget by orders of magnitude
+    rows, failures = stress(BUDGET, min_size=16384, max_size=65536)
+    assert rows
+    # a single timing can catch a scheduler hiccup; a real regression fails every retry
+    slow = [(f["case"], f["input"], f["size"]) for f in failures
+            if _best_per_mb(f["case"], f["input"], f["size"]) > BUDGET]
+    assert slow == []
+
+def test_clean_text_matches_the_reference():
+    assert fuzz_clean_text(n=5000, seed=1) == []
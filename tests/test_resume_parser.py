@@ -0,0 +1,54 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import types
+
+from src.bench_corpus import make_pdf
+from src.resume_parser import PDF_TIMEOUT, extract_pdf
+
+def test_page_limit_does_not_extract_the_next_page(monkeypatch):
+    extracted = []
+    class Page:
+        def __init__(self, i):
+            self.i = i
+        def extract_text(self):
+            extracted.append(self.i)
+            return f"page {self.i}"
+    class Pdf:
+        pages = [Page(i) for i in range(5)]
+        def __enter__(self):
+            return self
+        def __exit__(self, *exc):
+            return False
+    monkeypatch.setitem(sys.modules, "pdfplumber", types.SimpleNamespace(open=lambda f: Pdf()))
+    res = extract_pdf(io.BytesIO(b""), max_pages=2)
+    assert res.pages == ["page 0", "page 1"] and res.truncated == "max_pages"
+    assert extracted == [0, 1]
+    assert extract_pdf(io.BytesIO(b""), max_pages=5).truncated is None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# spawned sandbox children import src.* by name, so run under a "src" symlink like test_startup
+_SANDBOX_PROBE = """
+import io, json, sys, threading
+from src.resume_parser import parse_resume
+data = open(sys.argv[1], "rb").read()
+out = []
+t = threading.Thread(target=lambda: out.append(parse_resume(io.BytesIO(data), sandbox=True, max_pages=2)))
+t.start()
+t.join()
+print(json.dumps({k: out[0][k] for k in ("raw_text", "skills", "pages", "truncated")}))
+"""
+
+def test_sandboxed_parse_from_a_worker_thread(tmp_path):
+    pdf = tmp_path / "r.pdf"
+    pdf.write_bytes(make_pdf([["Alice Smith python docker"], ["kubernetes"], ["page three"]]))
+    (tmp_path / "src").symlink_to(ROOT, target_is_directory=True)
+    env = dict(os.environ, PYTHONPATH=str(tmp_path))
+    out = subprocess.run([sys.executable, "-c", _SANDBOX_PROBE, str(pdf)], capture_output=True, text=True,
+                         env=env, check=True, cwd=tmp_path, timeout=PDF_TIMEOUT)
+    res = json.loads(out.stdout)
+    assert res["raw_text"] == "Alice Smith python docker\nkubernetes"
+    assert res["skills"] == ["docker", "kubernetes", "python"]
+    assert res["pages"] == 2 and res["truncated"] == "max_pages"
@@ -0,0 +1,68 @@
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from src.service import BatchedEmbedder, MicroBatcher, make_handler
+
+class StubService:
+    def parse(self, data):
+        raise ValueError("ValueError: no text extracted (empty document)")
+
+    def score(self, resume_text, jd_text):
+        return {"resume_text": resume_text, "jd_text": jd_text}
+
+    def rank(self, jd_text, resumes, top_k=10):
+        return {"n": len(resumes), "top_k": top_k}
+
+@pytest.fixture(scope="module")
+def post():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(StubService(), max_body=4096))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    def call(path, body):
+        conn = http.client.HTTPConnection(*server.server_address)
+        conn.request("POST", path, body if isinstance(body, bytes) else json.dumps(body).encode())
+        resp = conn.getresponse()
+        out = resp.status, json.loads(resp.read())
+        conn.close()
+        return out
+    yield call
+    server.shutdown()
+    server.server_close()
+
+@pytest.mark.parametrize("path,body,error", [
+    ("/score", {"resume_text": None, "jd_text": "x"}, "field 'resume_text' must be a string"),
+    ("/score", {"jd_text": "x"}, "missing field 'resume_text'"),
+    ("/score", ["x"], "request body must be a JSON object"),
+    ("/score", b"{not json", None),
+    ("/rank", {"jd_text": "x", "resumes": "abc"}, "field 'resumes' must be an array"),
+    ("/rank", {"jd_text": "x", "resumes": ["a", {"raw_text": "b"}]}, "resumes[1] must be"),
+    ("/rank", {"jd_text": "x", "resumes": [], "top_k": "5"}, "field 'top_k' must be an integer"),
+    ("/rank", {"jd_text": 3, "resumes": []}, "field 'jd_text' must be a string"),
+])
+def test_bad_requests_are_400(post, path, body, error):
+    status, payload = post(path, body)
+    assert status == 400
+    if error:
+        assert payload["error"].startswith(error)
+
+def test_valid_requests(post):
+    assert post("/score", {"resume_text": "a", "jd_text": "b"}) == (200, {"resume_text": "a", "jd_text": "b"})
+    assert post("/rank", {"jd_text": "b", "resumes": ["a", {"raw_text": "c", "skills": ["sql"]}]}) == (200, {"n": 2, "top_k": 10})
+
+def test_oversized_body_is_413(post):
+    status, payload = post("/parse", b"%PDF" + b"x" * 5000)
+    assert status == 413 and payload["error"] == "request body exceeds 4096 bytes"
+    assert post("/score", {"resume_text": "a", "jd_text": "b"})[0] == 200
+
+def test_parse_error_is_not_double_prefixed(post):
+    assert post("/parse", b"%PDF") == (400, {"error": "ValueError: no text extracted (empty document)"})
+
+def test_batched_similarity():
+    vecs = {"q": [1.0, 0.0], "a": [0.6, 0.8], "b": [-1.0, 0.0]}
+    emb = BatchedEmbedder(MicroBatcher(lambda texts: np.array([vecs[t] for t in texts], dtype=np.float32)))
+    assert emb.similarity("q", "a") == pytest.approx(0.6)
+    assert np.allclose(emb.similarities("q", ["a", "b"]), [0.6, 0.0])
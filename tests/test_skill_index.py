@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from src.matcher import compute_skill_coverage
+from src.skill_index import BitMap, SkillIndex
+
+SKILLS = ["python", "docker", "java", "sql", "aws", "machine learning", "go", "spring boot"]
+QUERIES = [
+    ("python AND docker AND NOT java", lambda s: {"python", "docker"} <= s and "java" not in s),
+    ('ml OR (go AND NOT "spring boot")', lambda s: "machine learning" in s or ("go" in s and "spring boot" not in s)),
+    ("NOT sql", lambda s: "sql" not in s),
+]
+
+@pytest.mark.parametrize("roaring", [False, pytest.param(True, marks=pytest.mark.skipif(BitMap is None, reason="no pyroaring"))])
+def test_matches_brute_force_under_churn(roaring):
+    rnd = random.Random(0)
+    idx, truth = SkillIndex(roaring=roaring), {}
+    for step in range(2000):
+        if rnd.random() < 0.7 or not truth:
+            cid = f"c{rnd.randrange(700)}"
+            skills = rnd.sample(SKILLS, rnd.randint(0, 5))
+            idx.add(cid, skills)
+            truth[cid] = set(skills)
+        else:
+            cid = rnd.choice(sorted(truth))
+            assert idx.remove(cid)
+            del truth[cid]
+        if step % 250 == 249:
+            assert len(idx) == len(truth)
+            for expr, pred in QUERIES:
+                assert set(idx.query(expr)) == {c for c, s in truth.items() if pred(s)}
+            req = rnd.sample(SKILLS, 4)
+            want = {c: compute_skill_coverage(sorted(s), req)[0] for c, s in truth.items()}
+            assert idx.coverage(req, 0.5) == {c: v for c, v in want.items() if v >= 0.5}
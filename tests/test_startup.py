@@ -0,0 +1,36 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.bench import _STARTUP_PROBE, HEAVY_MODULES, STARTUP_MODULES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# generous for a cold CI box; locally these imports take ~10 ms
+BUDGET = 0.5
+# scoring also goes through these; they may pull numpy but never the model stack
+SCORING_MODULES = ["src.jd_parser", "src.embedder", "src.ranker", "src.ats_batch"]
+
+def _probe(tmp_path, modules):
+    link = tmp_path / "src"
+    if not link.exists():
+        link.symlink_to(ROOT, target_is_directory=True)
+    env = dict(os.environ, PYTHONPATH=str(tmp_path))
+    out = subprocess.run([sys.executable, "-c", _STARTUP_PROBE, ",".join(modules), ",".join(HEAVY_MODULES)],
+                         capture_output=True, text=True, env=env, check=True, cwd=tmp_path)
+    return json.loads(out.stdout)
+
+def test_parse_modules_import_lazily_and_fast(tmp_path):
+    best = None
+    for _ in range(3):
+        r = _probe(tmp_path, STARTUP_MODULES)
+        assert r["heavy"] == []
+        best = r["seconds"] if best is None else min(best, r["seconds"])
+    assert best < BUDGET
+
+@pytest.mark.parametrize("module", SCORING_MODULES)
+def test_scoring_modules_do_not_load_the_model_stack(tmp_path, module):
+    heavy = _probe(tmp_path, [module])["heavy"]
+    assert "torch" not in heavy and "sentence_transformers" not in heavy
@@ -0,0 +1,24 @@
+from src.skill_matcher import SkillMatcher
+from src.taxonomy import Taxonomy, build_taxonomy
+
+SOURCE = """id,name,aliases
+S1,Kubernetes,k8s|kube
+S2,Machine Learning,ML
+S3,C++,cpp
+S4,Go,golang
+S5,Node.js,nodejs
+"""
+
+TEXT = "Ran k8s and kubernetes clusters; ML in C++ and golang, node.js/nodejs. Gopher, mlops, c++17."
+
+def test_stored_matcher_matches_built_one(tmp_path):
+    src = tmp_path / "skills.csv"
+    src.write_text(SOURCE)
+    out = str(tmp_path / "skills.bin")
+    build_taxonomy(str(src), out, version=4)
+    tax = Taxonomy(out)
+    assert tax.version == 4 and tax.canonical("K8S") == "kubernetes"
+    expected = list(SkillMatcher(tax.term_map()).iter_matches(TEXT))
+    m = tax.matcher()
+    assert list(m.iter_matches(TEXT)) == expected
+    assert m.find(TEXT) == ["c++", "go", "kubernetes", "machine learning", "node.js"]
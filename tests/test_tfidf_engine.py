@@ -0,0 +1,54 @@
+import json
+
+import numpy as np
+
+from src import embedder
+from src.tfidf_engine import TfidfEngine, main
+
+DOCS = [
+    "Senior Python developer building Django web services and REST APIs",
+    "Python data engineer with Spark, Airflow and SQL pipelines",
+    "Head chef running a busy restaurant kitchen and menu planning",
+    "Registered nurse in intensive care with patient triage experience",
+]
+
+def test_fit_transform_scores_related_text_higher():
+    engine = TfidfEngine.fit(DOCS)
+    m = engine.transform(DOCS)
+    assert np.allclose(np.asarray(m.multiply(m).sum(axis=1)).ravel(), 1.0)
+    s = engine.score("python developer for web APIs", m)
+    assert int(np.argmax(s)) == 0 and s[2] == 0
+
+def test_stop_words_do_not_make_unrelated_texts_similar():
+    a = "I am a software engineer with experience in the design of the web services for the team."
+    b = "The chef is in charge of the kitchen and is responsible for the menu of the restaurant."
+    engine = TfidfEngine()
+    assert float(engine.score(a, engine.transform([b]))[0]) < 0.1
+
+def test_partial_fit_accumulates_idf():
+    engine = TfidfEngine().partial_fit(DOCS[:2]).partial_fit(DOCS[2:])
+    assert engine.n_docs == 4
+    s = engine.score("python kitchen", engine.transform(DOCS[:3]))
+    # "python" appears in two documents, "kitchen" in one: the rarer term weighs more
+    assert s[2] > s[0]
+
+def test_save_load_roundtrip(tmp_path):
+    for engine in (TfidfEngine.fit(DOCS), TfidfEngine().partial_fit(DOCS)):
+        path = str(tmp_path / "engine.pkl")
+        engine.save(path)
+        loaded = TfidfEngine.load(path)
+        assert loaded.hashing == engine.hashing
+        assert np.allclose(loaded.transform(DOCS).toarray(), engine.transform(DOCS).toarray())
+
+def test_cli_fits_ingest_output_and_embedder_loads_it(tmp_path, monkeypatch):
+    corpus = tmp_path / "parsed.jsonl"
+    rows = [{"source": f"r{i}.pdf", "ok": True, "raw_text": t} for i, t in enumerate(DOCS)]
+    rows.append({"source": "bad.pdf", "ok": False, "raw_text": ""})
+    corpus.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    out = str(tmp_path / "tfidf.pkl")
+    main(["fit", str(corpus), "-o", out])
+    assert len(TfidfEngine.load(out).vectorizer.vocabulary_) > 0
+
+    monkeypatch.setattr(embedder, "TFIDF_ENGINE_PATH", out)
+    monkeypatch.setattr(embedder, "_default_tfidf", None)
+    assert not embedder._shared_tfidf().hashing
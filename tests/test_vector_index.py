@@ -0,0 +1,81 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from src.vector_index import ResumeIndex
+
+def _unit(i, dim=4):
+    v = np.zeros(dim, dtype=np.float32)
+    v[i] = 1.0
+    return v
+
+def test_reopen_and_search(tmp_path):
+    idx = ResumeIndex(str(tmp_path))
+    idx.add(["a", "b"], np.stack([_unit(0), _unit(1)]), [["K8s"], ["python"]])
+    idx.delete(["b"])
+    idx2 = ResumeIndex(str(tmp_path))
+    assert len(idx2) == 1
+    hits = idx2.search(_unit(0), required_skills=["kubernetes"])
+    assert [(h["id"], h["score"]) for h in hits] == [("a", 1.0)]
+
+def test_recovers_from_crash_between_appends(tmp_path):
+    idx = ResumeIndex(str(tmp_path))
+    idx.add(["x"], _unit(0)[None])
+    # crash mid-add: vector rows written (one whole, one torn), log line torn
+    with open(tmp_path / "vectors.f32", "ab") as f:
+        f.write(np.full(4, 9, dtype=np.float32).tobytes() + b"\0\0")
+    with open(tmp_path / "log.jsonl", "a") as f:
+        f.write('{"row": 1, "id": "ghost", "sk')
+
+    idx2 = ResumeIndex(str(tmp_path))
+    assert idx2.ids == ["x"]
+    assert os.path.getsize(tmp_path / "vectors.f32") == 4 * 4
+    idx2.add(["y"], _unit(1)[None])
+
+    idx3 = ResumeIndex(str(tmp_path))
+    assert [(h["id"], h["score"]) for h in idx3.search(_unit(1), top_k=1)] == [("y", 1.0)]
+    assert [json.loads(ln)["id"] for ln in open(tmp_path / "log.jsonl")] == ["x", "y"]
+
+def test_log_lines_without_vector_rows_are_dropped(tmp_path):
+    idx = ResumeIndex(str(tmp_path))
+    idx.add(["x"], _unit(0)[None])
+    with open(tmp_path / "log.jsonl", "a") as f:
+        f.write(json.dumps({"row": 1, "id": "ghost", "skills": []}) + "\n")
+    assert ResumeIndex(str(tmp_path)).ids == ["x"]
+
+def test_ivf_assignments_realigned(tmp_path):
+    idx = ResumeIndex(str(tmp_path))
+    idx.add([f"c{i}" for i in range(8)], np.stack([_unit(i % 4) for i in range(8)]))
+    idx.build_ivf(n_lists=4)
+    # crash after the log line but before the row's IVF assignment
+    with open(tmp_path / "vectors.f32", "ab") as f:
+        f.write(_unit(2).tobytes())
+    with open(tmp_path / "log.jsonl", "a") as f:
+        f.write(json.dumps({"row": 8, "id": "late", "skills": []}) + "\n")
+    idx2 = ResumeIndex(str(tmp_path))
+    assert len(idx2.assign) == len(idx2.ids) == 9
+    assert os.path.getsize(tmp_path / "ivf_assign.i32") == 9 * 4
+    assert idx2.search(_unit(2), top_k=3, mode="ivf", nprobe=1)[0]["score"] == 1.0
+
+def test_corrupt_line_before_the_tail_is_an_error(tmp_path):
+    idx = ResumeIndex(str(tmp_path))
+    idx.add(["x", "y"], np.stack([_unit(0), _unit(1)]))
+    lines = open(tmp_path / "log.jsonl").read().splitlines(keepends=True)
+    with open(tmp_path / "log.jsonl", "w") as f:
+        f.write("{oops\n" + lines[1])
+    with pytest.raises(ValueError):
+        ResumeIndex(str(tmp_path))
+
+def test_unserialisable_id_leaves_the_index_unchanged(tmp_path):
+    idx = ResumeIndex(str(tmp_path))
+    idx.add(["a"], _unit(0)[None])
+    with pytest.raises(ValueError, match="JSON"):
+        idx.add(["b", np.int64(7)], np.stack([_unit(1), _unit(2)]))
+    assert idx.ids == ["a"] and len(idx.deleted) == 1
+    assert os.path.getsize(tmp_path / "vectors.f32") == 4 * 4
+    idx.add(["c"], _unit(2)[None])
+    idx2 = ResumeIndex(str(tmp_path))
+    assert idx2.ids == ["a", "c"]
+    assert [h["id"] for h in idx2.search(_unit(2), top_k=1)] == ["c"]
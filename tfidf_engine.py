@@ -0,0 +1,113 @@
+import argparse
+import json
+import os
+import pickle
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+class TfidfEngine:
+    """
+    Offline fallback for TextEmbedder when sentence-transformers is missing.
+
+    Two modes:
+      - fitted: a TfidfVectorizer fit once on a reference corpus (TfidfEngine.fit)
+      - hashing: a stateless HashingVectorizer whose IDF is accumulated
+        incrementally with partial_fit(); with no data it degrades to plain tf.
+    Vectors stay sparse (CSR, l2-normalised rows); scoring a query against N rows
+    is one sparse matrix-vector product. English stop words are dropped in both
+    modes, so unfitted tf scores are not dominated by function words.
+
+        python -m src.tfidf_engine fit parsed.jsonl resumes_txt/ -o tfidf.pkl
+        RESUME_TFIDF_ENGINE=tfidf.pkl streamlit run src/app.py
+    """
+
+    def __init__(self, vectorizer=None, n_features=2 ** 18):
+        self.vectorizer = vectorizer
+        self.n_features = n_features
+        self.n_docs = 0
+        self.df = None
+        if vectorizer is None:
+            self._hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None,
+                                             stop_words="english")
+            self.df = np.zeros(n_features, dtype=np.int64)
+
+    @classmethod
+    def fit(cls, corpus, **kwargs):
+        kwargs.setdefault("sublinear_tf", True)
+        kwargs.setdefault("stop_words", "english")
+        return cls(TfidfVectorizer(**kwargs).fit(corpus))
+
+    @property
+    def hashing(self):
+        return self.vectorizer is None
+
+    def partial_fit(self, texts):
+        """Update document frequencies (hashing mode only)."""
+        if not self.hashing:
+            raise ValueError("partial_fit is only supported in hashing mode")
+        X = self._hasher.transform(texts)
+        self.df += np.bincount(X.indices, minlength=self.n_features)
+        self.n_docs += X.shape[0]
+        return self
+
+    def transform(self, texts):
+        if not self.hashing:
+            return self.vectorizer.transform(texts)
+        X = self._hasher.transform(texts).tocsr()
+        if self.n_docs:
+            # smooth idf, same formula as TfidfTransformer(smooth_idf=True)
+            idf = np.log((1 + self.n_docs) / (1 + self.df)) + 1
+            X.data *= idf[X.indices]
+        return normalize(X, copy=False)
+
+    def score(self, query, matrix):
+        """Cosine of one query text against pre-transformed sparse rows."""
+        q = self.transform([query])
+        return (matrix @ q.T).toarray().ravel()
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+def iter_corpus(paths):
+    """Texts from .txt files, directories of them, and src.ingest JSONL output (raw_text of ok rows)."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                yield from iter_corpus(os.path.join(root, fn) for fn in sorted(files)
+                                       if fn.endswith((".txt", ".jsonl")))
+        elif path.endswith(".jsonl"):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    rec = json.loads(line) if line.strip() else {}
+                    if rec.get("ok") and rec.get("raw_text"):
+                        yield rec["raw_text"]
+        else:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                yield f.read()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Fit the tf-idf fallback embedder on a resume corpus.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    f = sub.add_parser("fit")
+    f.add_argument("corpus", nargs="+", help=".txt files, directories of them, or src.ingest .jsonl output")
+    f.add_argument("-o", "--output", required=True)
+    f.add_argument("--hashing", action="store_true", help="accumulate idf in a hashing engine instead of a fitted vocabulary")
+    args = ap.parse_args(argv)
+    texts = list(iter_corpus(args.corpus))
+    if not texts:
+        ap.error("no texts found")
+    engine = TfidfEngine().partial_fit(texts) if args.hashing else TfidfEngine.fit(texts)
+    engine.save(args.output)
+    print(f"wrote {args.output}: {'hashing' if args.hashing else 'fitted'} engine over {len(texts)} documents")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Persistent resume-embedding index for JD-to-candidate search.
+
+Layout of an index directory:
+    meta.json      dim and model name
+    vectors.f32    append-only float32 matrix, one row per added resume (memory-mapped)
+    log.jsonl      append-only log: {"row", "id", "skills"} for adds, {"delete": id} for deletes
+    ivf.npy        optional coarse centroids (build_ivf)
+    ivf_assign.i32 centroid of every row, appended as rows are added
+
+Exact search is a blocked matrix product over the memory-mapped rows; the
+approximate mode probes the nprobe closest IVF lists only. Rows are expected to
+be L2-normalised (TextEmbedder.encode output), so scores are cosines.
+"""
+import json
+import os
+import threading
+
+import numpy as np
+
+from src.matcher import compute_skill_coverage
+from src.skills_db import canonical_skill
+
+class ResumeIndex:
+    def __init__(self, path, dim=None, model_name=None):
+        self.path = path
+        self.dim = dim
+        self.model_name = model_name
+        self.ids = []            # row -> candidate id
+        self.skills = []         # row -> lower-cased skills
+        self.row_of = {}         # live candidate id -> row
+        self.deleted = np.zeros(0, dtype=bool)
+        self._skill_rows = {}    # skill -> rows (including deleted; masked at query time)
+        self._mm = None
+        self.centroids = None
+        self.assign = np.zeros(0, dtype=np.int32)
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    # ---- persistence ----
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _load(self):
+        meta = self._file("meta.json")
+        if os.path.exists(meta):
+            with open(meta) as f:
+                m = json.load(f)
+            if self.dim is not None and m["dim"] != self.dim:
+                raise ValueError(f"index at {self.path} has dim {m['dim']}, not {self.dim}")
+            self.dim, self.model_name = m["dim"], m.get("model")
+        vec_path = self._file("vectors.f32")
+        row_bytes = 4 * (self.dim or 0)
+        n_rows = os.path.getsize(vec_path) // row_bytes if row_bytes and os.path.exists(vec_path) else 0
+        deleted = []
+        log_path = self._file("log.jsonl")
+        if os.path.exists(log_path):
+            with open(log_path, "rb") as f:
+                lines = f.read().splitlines(keepends=True)
+            committed = 0   # bytes of log replayed
+            for i, ln in enumerate(lines):
+                # add() writes vector rows before their log lines, so a crash leaves at most a
+                # torn last line, or log lines whose rows are complete but unlogged rows
+                try:
+                    rec = json.loads(ln) if ln.strip() else {}
+                except ValueError:
+                    if i == len(lines) - 1:
+                        break
+                    raise ValueError(f"{log_path}: line {i + 1} is corrupt")
+                if not ln.endswith(b"\n") or ("id" in rec and len(self.ids) >= n_rows):
+                    break
+                if "delete" in rec:
+                    row = self.row_of.pop(rec["delete"], None)
+                    if row is not None:
+                        deleted.append(row)
+                elif rec:
+                    self._index_row(rec["id"], rec["skills"])
+                committed += len(ln)
+            if committed < sum(map(len, lines)):
+                with open(log_path, "r+b") as f:
+                    f.truncate(committed)
+        # drop vector rows (and half rows) that never got a log line, so the next add lines up
+        if os.path.exists(vec_path) and os.path.getsize(vec_path) != len(self.ids) * row_bytes:
+            with open(vec_path, "r+b") as f:
+                f.truncate(len(self.ids) * row_bytes)
+        self.deleted = np.zeros(len(self.ids), dtype=bool)
+        self.deleted[deleted] = True
+        # a re-added id leaves its older rows behind; those are dead too
+        live = np.zeros(len(self.ids), dtype=bool)
+        live[list(self.row_of.values())] = True
+        self.deleted |= ~live
+        if os.path.exists(self._file("ivf.npy")):
+            self.centroids = np.load(self._file("ivf.npy"))
+            assign_path = self._file("ivf_assign.i32")
+            assign = np.fromfile(assign_path, dtype=np.int32) if os.path.exists(assign_path) else self.assign
+            if len(assign) != len(self.ids):
+                # assignments are appended after the log; assign rows that missed it
+                tail = np.argmax(np.asarray(self._matrix()[len(assign):]) @ self.centroids.T, axis=1)
+                assign = np.concatenate([assign[:len(self.ids)], tail.astype(np.int32)])
+                assign.tofile(assign_path)
+            self.assign = assign
+
+    def _index_row(self, cid, skills):
+        row = len(self.ids)
+        old = self.row_of.get(cid)
+        if old is not None and old < len(self.deleted):
+            self.deleted[old] = True
+        self.ids.append(cid)
+        self.skills.append(skills)
+        self.row_of[cid] = row
+        for s in skills:
+            self._skill_rows.setdefault(s, []).append(row)
+        return row
+
+    def _matrix(self):
+        n = len(self.ids)
+        if n == 0:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        if self._mm is None or self._mm.shape[0] != n:
+            self._mm = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r", shape=(n, self.dim))
+        return self._mm
+
+    # ---- updates ----
+    def add(self, ids, vectors, skills=None):
+        """Append candidates; re-adding an existing id replaces it."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(ids) != len(vectors):
+            raise ValueError("vectors must be (len(ids), dim)")
+        skills = skills or [[] for _ in ids]
+        with self._lock:
+            # serialise every log line before touching the files, so a bad id or
+            # skill (e.g. a numpy integer) leaves the index as it was
+            skills = [sorted({canonical_skill(s) for s in sk}) for sk in skills]
+            try:
+                lines = [json.dumps({"row": len(self.ids) + i, "id": cid, "skills": sk}) + "\n"
+                         for i, (cid, sk) in enumerate(zip(ids, skills))]
+            except TypeError as e:
+                raise ValueError(f"ids and skills must be JSON-serialisable: {e}") from None
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                with open(self._file("meta.json"), "w") as f:
+                    json.dump({"dim": self.dim, "model": self.model_name}, f)
+            if vectors.shape[1] != self.dim:
+                raise ValueError(f"expected dim {self.dim}, got {vectors.shape[1]}")
+            with open(self._file("vectors.f32"), "ab") as f:
+                f.write(vectors.tobytes())
+            self.deleted = np.concatenate([self.deleted, np.zeros(len(ids), dtype=bool)])
+            with open(self._file("log.jsonl"), "a") as f:
+                f.writelines(lines)
+            for cid, sk in zip(ids, skills):
+                self._index_row(cid, sk)
+            if self.centroids is not None:
+                a = np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+                with open(self._file("ivf_assign.i32"), "ab") as f:
+                    f.write(a.tobytes())
+                self.assign = np.concatenate([self.assign, a])
+
+    def delete(self, ids):
+        with self._lock, open(self._file("log.jsonl"), "a") as f:
+            for cid in ids:
+                row = self.row_of.pop(cid, None)
+                if row is not None:
+                    self.deleted[row] = True
+                    f.write(json.dumps({"delete": cid}) + "\n")
+
+    def __len__(self):
+        return len(self.row_of)
+
+    # ---- search ----
+    def _filter_mask(self, required_skills, min_coverage):
+        """Rows whose coverage of required_skills (as in compute_skill_coverage) reaches min_coverage."""
+        req = {canonical_skill(s) for s in required_skills}
+        counts = np.zeros(len(self.ids), dtype=np.int32)
+        for s in req:
+            rows = self._skill_rows.get(s)
+            if rows:
+                counts[rows] += 1
+        return counts >= min_coverage * len(req) - 1e-9
+
+    def _allowed(self, required_skills, min_coverage):
+        allowed = ~self.deleted
+        if required_skills:
+            allowed &= self._filter_mask(required_skills, min_coverage)
+        return allowed
+
+    @staticmethod
+    def _top(scores, rows, k):
+        if len(scores) > k:
+            part = np.argpartition(-scores, k - 1)[:k]
+            scores, rows = scores[part], rows[part]
+        order = np.argsort(-scores, kind="stable")
+        return scores[order], rows[order]
+
+    def _exact(self, q, top_k, allowed, block):
+        mm = self._matrix()
+        best_s = np.zeros(0, dtype=np.float32)
+        best_r = np.zeros(0, dtype=np.int64)
+        for start in range(0, mm.shape[0], block):
+            end = min(start + block, mm.shape[0])
+            ok = allowed[start:end]
+            if not ok.any():
+                continue
+            s = np.asarray(mm[start:end] @ q)[ok]
+            r = np.arange(start, end)[ok]
+            best_s, best_r = self._top(np.concatenate([best_s, s]), np.concatenate([best_r, r]), top_k)
+        return best_s, best_r
+
+    def _ivf(self, q, top_k, allowed, nprobe):
+        probe = np.argsort(-(self.centroids @ q))[:nprobe]
+        rows = np.flatnonzero(np.isin(self.assign, probe) & allowed[:len(self.assign)])
+        # rows added before the IVF existed or beyond the assignment file are always scanned
+        if len(self.assign) < len(self.ids):
+            tail = np.arange(len(self.assign), len(self.ids))
+            rows = np.concatenate([rows, tail[allowed[tail]]])
+        if len(rows) == 0:
+            return np.zeros(0, dtype=np.float32), rows
+        s = np.asarray(self._matrix()[rows] @ q)
+        return self._top(s, rows, top_k)
+
+    def search(self, query, top_k=10, required_skills=None, min_coverage=1.0, mode="exact", nprobe=8, block=65536):
+        """
+        Top-k live candidates for a query vector as dicts {id, score, skill_coverage,
+        matched_skills, missing_skills}. required_skills/min_coverage filter candidates
+        by skill coverage before scoring. mode: "exact" or "ivf" (needs build_ivf()).
+        """
+        if not self.ids:
+            return []
+        q = np.asarray(query, dtype=np.float32).ravel()
+        allowed = self._allowed(required_skills, min_coverage)
+        if mode == "ivf":
+            if self.centroids is None:
+                raise ValueError("build_ivf() has not been run for this index")
+            scores, rows = self._ivf(q, top_k, allowed, nprobe)
+        else:
+            scores, rows = self._exact(q, top_k, allowed, block)
+        out = []
+        for s, r in zip(scores.tolist(), rows.tolist()):
+            cov, matched, missing = compute_skill_coverage(self.skills[r], required_skills or [])
+            out.append({"id": self.ids[r], "score": s, "skill_coverage": cov,
+                        "matched_skills": matched, "missing_skills": missing})
+        return out
+
+    # ---- approximate mode ----
+    def build_ivf(self, n_lists=None, iters=10, sample=100_000, seed=0, block=65536):
+        """Spherical k-means over (a sample of) the live rows, then assign every row to a list."""
+        mm = self._matrix()
+        live = np.flatnonzero(~self.deleted)
+        if len(live) == 0:
+            raise ValueError("index is empty")
+        n_lists = n_lists or max(1, int(np.sqrt(len(live))))
+        rng = np.random.default_rng(seed)
+        pick = np.sort(rng.choice(live, min(sample, len(live)), replace=False))
+        X = np.asarray(mm[pick])
+        C = X[rng.choice(len(X), min(n_lists, len(X)), replace=False)].copy()
+        for _ in range(iters):
+            a = np.argmax(X @ C.T, axis=1)
+            for j in range(len(C)):
+                members = X[a == j]
+                if len(members):
+                    c = members.sum(axis=0)
+                    C[j] = c / (np.linalg.norm(c) or 1.0)
+        assign = np.concatenate([np.argmax(np.asarray(mm[s:s + block]) @ C.T, axis=1)
+                                 for s in range(0, mm.shape[0], block)]).astype(np.int32)
+        with self._lock:
+            np.save(self._file("ivf.npy"), C)
+            assign.tofile(self._file("ivf_assign.i32"))
+            self.centroids, self.assign = C, assign
+        return len(C)
+
+    def recall(self, queries, top_k=10, nprobe=8):
+        """Mean recall@k of the IVF mode against exact search for the given query vectors."""
+        hits = total = 0
+        for q in np.atleast_2d(queries):
+            exact = {r["id"] for r in self.search(q, top_k)}
+            approx = {r["id"] for r in self.search(q, top_k, mode="ivf", nprobe=nprobe)}
+            hits += len(exact & approx)
+            total += len(exact)
+        return hits / total if total else 1.0